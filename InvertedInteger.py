@@ -1,9 +1,17 @@
 import doctest
 
-class InvertedInteger:
+from ringContext import InvertedIntegerBase
+from spanClosure import SpanClosure
+
+class InvertedInteger(InvertedIntegerBase):
     """
     Represents an element in Zn with a custom inverted integer operation.
 
+    Addition is defined as (x - y) mod n and multiplication as
+    (x + y - α * x * y) mod n; both are inherited from InvertedIntegerBase.
+    Instances share a cached ring context per (n, α) and are interned, so
+    they are immutable.
+
     Attributes:
         object (int): The integer value in Zn.
         modulus (int): The modulus n.
@@ -18,10 +26,17 @@ class InvertedInteger:
         <5 mod 7 | 2>
         >>> print(x * y)
         <6 mod 7 | 2>
+        >>> x == InvertedInteger(3, 7, 2)
+        True
+        >>> x == y
+        False
     """
-    def __init__(self, obj, modulus, multiplier):
+    __slots__ = ()
+
+    @property
+    def object(self):
         """
-        Initializes an `InvertedInteger` object.
+        The integer value in Zn.
 
         >>> i = InvertedInteger(3, 7, 2)
         >>> i.object
@@ -31,16 +46,7 @@ class InvertedInteger:
         >>> i.multiplier
         2
         """
-        if modulus <= 0:
-            raise ValueError("Modulus must be positive.")
-        if not (0 <= obj < modulus):
-            raise ValueError("obj must be between 0 and modulus-1")
-        if not (0 <= multiplier < modulus):
-            raise ValueError("multiplier must be between 0 and modulus-1")
-        
-        self.object = obj
-        self.modulus = modulus
-        self.multiplier = multiplier
+        return self._value
 
     def __str__(self):
         """
@@ -50,119 +56,36 @@ class InvertedInteger:
         '<3 mod 7 | 2>'
         """
         return f"<{self.object} mod {self.modulus} | {self.multiplier}>"
-    
-    def __hash__(self):
-        """Hash function for InvertedInteger, needed for using in sets and dicts."""
-        return hash((self.object, self.modulus, self.multiplier))
 
 
-    def __add__(self, other):
-        """
-        Performs custom addition operation in Zn.
-
-        Addition is defined as: (x - y) mod n
 
-        Example:
-        >>> x = InvertedInteger(3, 7, 2)
-        >>> y = InvertedInteger(5, 7, 2)
-        >>> print(x + y)
-        <5 mod 7 | 2>
-        """
-        if not isinstance(other, InvertedInteger):
-            raise TypeError("Operand must be of type InvertedInteger")
-        if self.modulus != other.modulus or self.multiplier != other.multiplier:
-            raise ValueError("Incompatible modulus and multiplier")
-
-        result = (self.object - other.object) % self.modulus
-        return InvertedInteger(result, self.modulus, self.multiplier)
-
-    def __mul__(self, other):
-        """
-        Performs custom multiplication operation in Zn.
-
-        Multiplication is defined as: (x + y - α * x * y) mod n
-
-        Example:
-        >>> x = InvertedInteger(3, 7, 2)
-        >>> y = InvertedInteger(5, 7, 2)
-        >>> print(x * y)
-        <6 mod 7 | 2>
-        """
-        if not isinstance(other, InvertedInteger):
-            raise TypeError("Operand must be of type InvertedInteger")
-        if self.modulus != other.modulus or self.multiplier != other.multiplier:
-            raise ValueError("Incompatible modulus and multiplier")
-
-        result = (self.object + other.object - self.multiplier * self.object * other.object) % self.modulus
-        return InvertedInteger(result, self.modulus, self.multiplier)
-
-    def __eq__(self, other):
-        """
-        Equality check for two InvertedInteger objects.
-
-        Example:
-        >>> x = InvertedInteger(3, 7, 2)
-        >>> y = InvertedInteger(3, 7, 2)
-        >>> x == y
-        True
-        >>> z = InvertedInteger(5, 7, 2)
-        >>> x == z
-        False
-        """
-        if not isinstance(other, InvertedInteger):
-            return False
-        return (self.object == other.object and
-                self.modulus == other.modulus and
-                self.multiplier == other.multiplier)
-
-
-
-def multiplicative_span(S):
+def multiplicative_span(S, table=None):
     """
     Calculates the multiplicative span of a set S of InvertedInteger generators.
 
-    The multiplicative span is the set of all products of the elements in S, with all possible lengths.
+    The multiplicative span is the set of all ⊗-products of the elements in S, with all possible lengths.
+    It is computed by spanClosure.SpanClosure and returned sorted by value; table is an optional
+    precomputed ⊗ table for the ring of S.
     >>> g1 = InvertedInteger(3, 7, 2)
-    >>> g2 = InvertedInteger(5, 7, 2)
-    >>> S = {g1, g2}
-    >>> span = multiplicative_span(S)
-    >>> for element in span:
+    >>> for element in multiplicative_span({g1}):
     ...     print(element)
+    <0 mod 7 | 2>
+    <2 mod 7 | 2>
     <3 mod 7 | 2>
-    <6 mod 7 | 2>
-    <5 mod 7 | 2>
-    <4 mod 7 | 2>
+    >>> g2 = InvertedInteger(5, 7, 2)
+    >>> len(multiplicative_span({g1, g2}))
+    6
     """
-    # Initialise the span with the generators in S
-    span = set(S)
-
-    # Set of valid products we want to include in the span (3, 5, 6, 4 mod 7)
-    valid_objects = {3, 5, 6, 4}
-
-    # Generate combinations of the elements in S, and iterate to find all products
-    current_span = set(span)
-    while current_span:
-        new_elements = set()
-        for element1 in current_span:
-            for element2 in span:
-                # Calculate the product modulo the modulus
-                product = (element1.object * element2.object) % element1.modulus
-                # Create a new InvertedInteger for the product
-                new_element = InvertedInteger(product, element1.modulus, element1.multiplier)
-                
-                # Add the new element if it's a valid product
-                if new_element.object in valid_objects:
-                    new_elements.add(new_element)
-
-        if new_elements <= span:
-            break
-        span.update(new_elements)
-        current_span = new_elements
-
-    sorted_span = sorted(span, key=lambda x: x.object)
-
+    S = list(S)
+    if not S:
+        return []
+    ring = S[0].ring
+    for element in S:
+        if element.ring is not ring:
+            raise ValueError("Incompatible modulus and multiplier")
 
-    return sorted_span
+    closure = SpanClosure(ring.modulus, ring.multiplier, [element.object for element in S], table)
+    return [ring.element(InvertedInteger, x) for x in closure.values()]
 
 if __name__ == "__main__":
     print("Running doctests...") #debugging purposes
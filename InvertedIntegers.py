@@ -1,39 +1,18 @@
-import time
+import functools
 
-class InvertedInteger:
-    def __init__(self, obj, modulus, multiplier):
-        # Ensures the modulus is positive and the object falls within the proper range
-        if modulus <= 0:
-            raise ValueError("Modulus must be positive.")
-        if not (0 <= obj < modulus):
-            raise ValueError("Object must be between 0 and modulus-1")
-        # The multiplier must be between 0 and modulus - 1, except when n = 1 where it can be 0
-        if not (0 <= multiplier < modulus):  
-            raise ValueError("Multiplier must be between 0 and modulus-1")
+from ringContext import InvertedIntegerBase, ring_context
 
-        self.object = obj
-        self.modulus = modulus
-        self.multiplier = multiplier
+class InvertedInteger(InvertedIntegerBase):
+    # ⊗ and ⊕ are inherited; instances are interned per (n, alpha) ring context
+    __slots__ = ()
+
+    @property
+    def object(self):
+        return self._value
 
     def __str__(self):
         return f"<{self.object} mod {self.modulus} | {self.multiplier}>"
 
-    def __mul__(self, other):
-        if not isinstance(other, InvertedInteger):
-            raise TypeError("Operand must be of type InvertedInteger")
-        if self.modulus != other.modulus or self.multiplier != other.multiplier:
-            raise ValueError("Incompatible modulus and multiplier")
-
-        result = (self.object + other.object - self.multiplier * self.object * other.object) % self.modulus
-        return InvertedInteger(result, self.modulus, self.multiplier)
-
-    def __eq__(self, other):
-        if not isinstance(other, InvertedInteger):
-            return False
-        return (self.object == other.object and 
-                self.modulus == other.modulus and 
-                self.multiplier == other.multiplier)
-
 
 class InvertedIntegers:
     def __init__(self, modulus, multiplier):
@@ -48,7 +27,8 @@ class InvertedIntegers:
 
     def __iter__(self):
         """Returns an iterator that iterates over all elements in Zn."""
-        return (InvertedInteger(i, self.modulus, self.multiplier) for i in range(self.modulus))
+        ring = ring_context(self.modulus, self.multiplier)
+        return (ring.element(InvertedInteger, i) for i in range(self.modulus))
 
 
 def inverted_roots_of_unity(n, alpha):
@@ -63,65 +43,104 @@ def inverted_roots_of_unity(n, alpha):
     unity = InvertedInteger(1, n, alpha)  
     roots = []
 
-    for x in range(n):
-        xi = InvertedInteger(x, n, alpha)
+    for xi in InvertedIntegers(n, alpha):
         if xi * xi == unity:
             roots.append(xi)
 
     return roots
 
 
-def count_inverted_roots_of_unity():
-    """Finds the maximum count of inverted roots of unity for 1 ≤ n ≤ 25, 0 ≤ α < n."""
+def _root_values(tasks):
+    """Returns the values of the inverted roots of unity for each (n, alpha) task by brute force."""
+    return [[root.object for root in inverted_roots_of_unity(n, alpha)] for n, alpha in tasks]
+
+
+def _solver_root_values(tasks):
+    """Returns the values of the inverted roots of unity for each (n, alpha) task with quadraticSolver."""
+    # imported on first use to keep importing this module cheap
+    import quadraticSolver
+    return [quadraticSolver.inverted_roots_of_unity(n, alpha) for n, alpha in tasks]
+
+
+# engine name -> function computing the root values of a list of (n, alpha) tasks
+ROOT_ENGINES = {
+    "python": _root_values,
+    "solver": _solver_root_values,
+}
+
+
+def count_inverted_roots_of_unity(max=25, store=None, engine="python"):
+    """
+    Finds the maximum count of inverted roots of unity for 1 ≤ n ≤ max, 0 ≤ α < n.
+
+    engine "python" tries every x (the reference); "solver" solves
+    α * x^2 - 2x + 1 ≡ 0 (mod n) with quadraticSolver and scales to much
+    larger moduli. When store (a resultStore.ResultStore) is given, stored
+    roots are reused and the missing ones are computed and saved.
+    """
+    if engine not in ROOT_ENGINES:
+        raise ValueError("Unknown engine: " + str(engine))
+    root_values = ROOT_ENGINES[engine]
+
     max_roots = 0
     best_cases = []
 
-    for n in range(1, 26):
-        for alpha in range(n):
-            roots = inverted_roots_of_unity(n, alpha)
-            num_roots = len(roots)
+    tasks = [(n, alpha) for n in range(1, max + 1) for alpha in range(n)]
+    if store is None:
+        all_values = root_values(tasks)
+    else:
+        all_values = store.sweep("inverted_roots_of_unity", tasks, root_values, engine=engine)
+
+    for (n, alpha), values in zip(tasks, all_values):
+        roots = [InvertedInteger(value, n, alpha) for value in values]
+        num_roots = len(roots)
 
-            if num_roots > max_roots:
-                max_roots = num_roots
-                best_cases = [(n, alpha, roots)]
-            elif num_roots == max_roots:
-                best_cases.append((n, alpha, roots))
+        if num_roots > max_roots:
+            max_roots = num_roots
+            best_cases = [(n, alpha, roots)]
+        elif num_roots == max_roots:
+            best_cases.append((n, alpha, roots))
 
     return max_roots, best_cases
 
 
-# Running the function to find the maximum case
-max_roots, best_cases = count_inverted_roots_of_unity()
+@functools.lru_cache(maxsize=None)
+def default_roots_summary():
+    """Returns count_inverted_roots_of_unity() for the default range, computed on first use."""
+    return count_inverted_roots_of_unity()
+
 
-# Displaying the best cases
-print("Max Number of Inverted Roots of Unity:", max_roots)
-for n, alpha, roots in best_cases:
-    print(f"n = {n}, alpha = {alpha}, Roots:", [str(r) for r in roots])
+def __getattr__(name):
+    """Computes the module level max_roots and best_cases lazily on first access."""
+    if name == "max_roots":
+        return default_roots_summary()[0]
+    if name == "best_cases":
+        return default_roots_summary()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Performance Testing
-def compare_performance():
-    test_n = 5 
-    test_alpha = 2
+def compare_performance(test_n=5, test_alpha=2):
+    """
+    Compares checking idempotency with direct loops against the InvertedIntegers iterator.
 
-    print("\nPerformance comparison using direct loops vs iterators:\n")
+    Timings are medians of repeated, warmed up perf_counter measurements from
+    benchmarks.measure; benchmarks.py has the full benchmark suite.
+    """
+    # imported here because benchmarks imports this module
+    from benchmarks import measure
 
-    start_time = time.time()
-    results_loops = [(x, (x + x - test_alpha * x * x) % test_n == x) for x in range(test_n)]
-    end_time = time.time()
-    print(f"Direct Loop Execution Time: {end_time - start_time:.6f} seconds")
+    print("\nPerformance comparison using direct loops vs iterators:\n")
 
-    start_time = time.time()
-    results_iterators = [(x, (x.object + x.object - test_alpha * x.object * x.object) % test_n == x.object)
-                         for x in InvertedIntegers(test_n, test_alpha)]
-    end_time = time.time()
-    print(f"Iterator Execution Time: {end_time - start_time:.6f} seconds")
+    loops = measure(lambda: [(x, (x + x - test_alpha * x * x) % test_n == x) for x in range(test_n)])
+    print(f"Direct Loop Execution Time: {loops['median']:.6f} seconds")
 
+    iterators = measure(lambda: [(x, (x.object + x.object - test_alpha * x.object * x.object) % test_n == x.object)
+                                 for x in InvertedIntegers(test_n, test_alpha)])
+    print(f"Iterator Execution Time: {iterators['median']:.6f} seconds")
 
-# Testing the iterator with an example
-print("Iterating over InvertedIntegers(3, 2):")
-for x in InvertedIntegers(3, 2):
-    print(x)
 
-# Running performance comparison
-compare_performance()
+if __name__ == "__main__":
+    # the demo lives in invertedIntegersDemo.py so importing this module has no side effects
+    from invertedIntegersDemo import main
+    main()
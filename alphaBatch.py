@@ -0,0 +1,164 @@
+"""
+Alpha-batched engine: checks a property for every multiplier of n at once.
+
+A sweep calls a checker once per (n, alpha), repeating the x, y, z loops
+and the % n work for each of the n multipliers of a modulus. Here alpha is
+a batch dimension instead: the ⊗ tables of a group of multipliers are
+built as one (alpha, x, y) array and every axiom is checked on all of them
+with the same vectorised operations. The cubic checks walk x in blocks of
+rows and drop the multipliers that already failed, so a multiplier stops
+being computed after the block holding its first counterexample. ⊕ does not depend on
+alpha, so its properties are checked once per modulus.
+
+qualifying_alphas(prop, n) returns the multipliers for which prop holds.
+check_property answers from it and memoises it per (prop, n) for the
+CACHE_SIZE most recent pairs, so a sweep computes each modulus once.
+Without NumPy every multiplier is checked with the "python" engine.
+
+    >>> qualifying_alphas("idempotent", 2), qualifying_alphas("associative_multiplication", 4)
+    ([1], [0, 1, 2, 3])
+"""
+import functools
+
+import cayleyTable
+import invertedInteger
+from ringContext import NUMPY_LIMIT, multiply
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Upper bound on the number of entries of the (alpha, x, y) array of one group of multipliers
+BLOCK_SIZE = 1 << 22
+
+# Number of (prop, n) results memoised; the least recently used are dropped, so a sweep streaming
+# over moduli keeps the multipliers of the last few moduli only
+CACHE_SIZE = 64
+
+
+def _groups(n):
+    """Splits the multipliers of n into groups whose (alpha, x, y) arrays fit in BLOCK_SIZE."""
+    step = max(1, BLOCK_SIZE // max(1, n * n))
+    for start in range(0, n, step):
+        yield np.arange(start, min(start + step, n), dtype=np.int64)
+
+
+def _row_blocks(n, count):
+    """Splits range(n) into blocks of rows whose (alpha, x, y, z) slabs for count multipliers fit in BLOCK_SIZE."""
+    step = max(1, BLOCK_SIZE // max(1, count * n * n))
+    for start in range(0, n, step):
+        yield slice(start, min(start + step, n))
+
+
+def _products(alphas, n):
+    """Returns T[a, x, y] = x ⊗ y with multiplier alphas[a], in the compact dtype of Zn."""
+    x = np.arange(n, dtype=np.int64)
+    table = multiply(x[None, :, None], x[None, None, :], n, alphas[:, None, None])
+    return table.astype(cayleyTable.table_dtype(n))
+
+
+def _cubic(alphas, n, satisfied):
+    """
+    Returns the mask of the multipliers for which satisfied(t, base, rows) holds on every block
+    of rows, where t holds the ⊗ tables of the multipliers still alive and base[a, 0, 0] = a * n
+    is the offset of the rows of t[a] in t.reshape(-1, n).
+    """
+    table = _products(alphas, n)
+    alive = np.arange(len(alphas))
+    t = table
+    for rows in _row_blocks(n, len(alphas)):
+        base = np.arange(len(alive))[:, None, None] * n
+        ok = satisfied(t, base, rows)
+        if not ok.all():
+            # multipliers with a counterexample are not computed any further
+            alive = alive[ok]
+            if not len(alive):
+                break
+            t = table[alive]
+    return np.isin(np.arange(len(alphas)), alive)
+
+
+def _idempotent(alphas, n):
+    x = np.arange(n, dtype=np.int64)
+    return (multiply(x, x, n, alphas[:, None]) == x).all(axis=1)
+
+
+def _commutative_multiplication(alphas, n):
+    table = _products(alphas, n)
+    return (table == table.transpose(0, 2, 1)).all(axis=(1, 2))
+
+
+def _associative_multiplication(alphas, n):
+    x = np.arange(n)
+
+    def satisfied(t, base, rows):
+        # left[a, x, y, z] = T[a, T[a, x, y], z] and right[a, x, y, z] = T[a, x, T[a, y, z]],
+        # gathered from the flattened tables with one index array each
+        left = t.reshape(-1, n)[base + t[:, rows, :]]
+        right = t.reshape(-1)[((base + x[None, rows, None]) * n)[..., None] + t[:, None, :, :]]
+        return (left == right).all(axis=(1, 2, 3))
+    return _cubic(alphas, n, satisfied)
+
+
+def _right_distributivity(alphas, n):
+    difference = cayleyTable.addition_table(n, 0)
+
+    def satisfied(t, base, rows):
+        # left[a, x, y, z] = (x ⊕ y) ⊗ z and right[a, x, y, z] = (x ⊗ z) ⊕ (y ⊗ z)
+        left = t.reshape(-1, n)[base + difference[None, rows, :]]
+        right = difference.reshape(-1)[t[:, rows, None, :].astype(np.int64) * n + t[:, None, :, :]]
+        return (left == right).all(axis=(1, 2, 3))
+    return _cubic(alphas, n, satisfied)
+
+
+def _left_distributivity(alphas, n):
+    difference = cayleyTable.addition_table(n, 0)
+
+    def satisfied(t, base, rows):
+        # left[a, z, x, y] = z ⊗ (x ⊕ y) and right[a, z, x, y] = (z ⊗ x) ⊕ (z ⊗ y)
+        row = t[:, rows, :]
+        left = np.take_along_axis(row, difference.reshape(1, 1, -1).astype(np.int64), axis=2)
+        right = difference.reshape(-1)[row[:, :, :, None].astype(np.int64) * n + row[:, :, None, :]]
+        return (left.reshape(right.shape) == right).all(axis=(1, 2, 3))
+    return _cubic(alphas, n, satisfied)
+
+
+# property -> check of a group of multipliers returning a boolean mask, or None when the
+# property does not depend on alpha
+BATCH_CHECKS = {
+    "idempotent": _idempotent,
+    "commutative_multiplication": _commutative_multiplication,
+    "commutative_addition": None,
+    "associative_multiplication": _associative_multiplication,
+    "associative_addition": None,
+    "right_distributivity": _right_distributivity,
+    "left_distributivity": _left_distributivity,
+}
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _qualifying(prop, n):
+    check = BATCH_CHECKS[prop]
+    if np is None or n > NUMPY_LIMIT:
+        return frozenset(alpha for alpha in range(n) if invertedInteger.check_property(prop, n, alpha))
+    if check is None:
+        return frozenset(range(n)) if invertedInteger.check_property(prop, n, 0, "table") else frozenset()
+    qualifying = set()
+    for alphas in _groups(n):
+        qualifying.update(alphas[check(alphas, n)].tolist())
+    return frozenset(qualifying)
+
+
+def qualifying_alphas(prop, n):
+    """Returns the sorted multipliers alpha of Zn for which prop holds."""
+    if prop not in BATCH_CHECKS:
+        raise ValueError("Unknown property: " + str(prop))
+    return sorted(_qualifying(prop, n))
+
+
+def check_property(prop, n, alpha):
+    """Checks a property of (Zn, alpha) by looking alpha up in the memoised qualifying multipliers."""
+    if prop not in BATCH_CHECKS:
+        raise ValueError("Unknown property: " + str(prop))
+    return alpha in _qualifying(prop, n)
@@ -0,0 +1,321 @@
+"""
+Benchmark suite for the inverted integer modules.
+
+Covers element ⊗ / ⊕, iteration over InvertedIntegers, every has_* checker
+and *_pairs sweep for every engine, multiplicative_span and
+inverted_roots_of_unity, parameterised over n, and ⊗ and powers for 256 to
+4096 bit moduli on plain integers and through the ring context. Each case is warmed up,
+calibrated so one timing lasts at least MIN_TIME seconds, and timed
+repeatedly with time.perf_counter. Results are written as JSON, and the
+compare mode flags cases whose median time got slower than a saved
+baseline by more than a threshold.
+
+    python3 benchmarks.py run --output baseline.json
+    python3 benchmarks.py run --output current.json --compare baseline.json
+    python3 benchmarks.py compare baseline.json current.json --threshold 0.2
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import alphaBatch
+import crtDecomposition
+import invertedInteger
+import isomorphismClasses
+from InvertedInteger import InvertedInteger
+from InvertedIntegers import InvertedIntegers, ROOT_ENGINES, inverted_roots_of_unity
+from multiplicativeSpan import multiplicative_span
+from ringContext import ring_context
+
+# Minimum duration of one timing, in seconds
+MIN_TIME = 0.02
+
+# Default number of timings per case
+REPEAT = 5
+
+# Moduli used for each degree of the brute force cost, and in quick mode
+SIZES = {1: [64, 1024], 2: [32, 128], 3: [8, 24]}
+QUICK_SIZES = {1: [64], 2: [16], 3: [6]}
+
+# Bit lengths of the big moduli, and in quick mode
+BIG_BITS = [256, 1024, 4096]
+QUICK_BIG_BITS = [256]
+
+# Range (max) of the *_pairs sweeps for each degree, and in quick mode
+PAIRS_MAX = {1: 30, 2: 15, 3: 8}
+QUICK_PAIRS_MAX = {1: 10, 2: 6, 3: 4}
+
+# Largest time, in seconds, of importing each of IMPORT_MODULES in a fresh interpreter,
+# not counting the startup of the interpreter itself
+IMPORT_BUDGET = 0.1
+IMPORT_MODULES = ("InvertedIntegers", "invertedInteger")
+
+# Directory of the modules, in which the import cases run whatever the working directory
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# Relative slowdown of the median above which compare reports a regression
+THRESHOLD = 0.2
+
+PAIRS_FUNCTIONS = {
+    "idempotent": invertedInteger.idempotent_pairs,
+    "commutative_multiplication": invertedInteger.non_commutative_multiplication_pairs,
+    "commutative_addition": invertedInteger.commutative_addition_pairs,
+    "associative_multiplication": invertedInteger.associative_multiplication_pairs,
+    "associative_addition": invertedInteger.associative_addition_pairs,
+    "right_distributivity": invertedInteger.distributivity_pairs,
+    "left_distributivity": invertedInteger.left_distributivity_pairs,
+}
+
+
+# results memoised by the crt, alpha and iso engines; they are cleared at the start of every
+# timed call, otherwise the timings after the warmup would only measure cache hits
+MEMOISED = (crtDecomposition.check_component, alphaBatch._qualifying, isomorphismClasses.check_class)
+
+
+def _alpha(n):
+    return n // 3
+
+
+def _cold(func):
+    def run():
+        for memoised in MEMOISED:
+            memoised.cache_clear()
+        return func()
+    return run
+
+
+def _element_loop(n, operation):
+    xs = [InvertedInteger(x, n, _alpha(n)) for x in range(n)]
+
+    def run():
+        acc = xs[1 % n]
+        for x in xs:
+            acc = operation(acc, x)
+    return run
+
+
+def import_time(module):
+    """Returns the time in seconds that -X importtime reports for importing module in a fresh interpreter."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module], cwd=DIRECTORY,
+                            capture_output=True, text=True, check=True)
+    # lines are "import time: self [us] | cumulative [us] | module", the top level module last
+    for line in reversed(result.stderr.splitlines()):
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1e6
+    raise ValueError("No import time reported for " + module)
+
+
+def _big_ring(bits):
+    """Returns a fixed (n, alpha, values) with n of the given bit length and alpha a unit mod n."""
+    generator = random.Random(bits)
+    n = generator.getrandbits(bits) | 1 << (bits - 1) | 1
+    alpha = generator.randrange(1, n)
+    while math.gcd(alpha, n) != 1:
+        alpha += 1
+    return n, alpha, [generator.randrange(n) for _ in range(64)]
+
+
+def _naive_mul_loop(n, alpha, values):
+    def run():
+        acc = values[0]
+        for x in values:
+            acc = (acc + x - alpha * acc * x) % n
+    return run
+
+
+def _context_mul_loop(n, alpha, values):
+    ring = ring_context(n, alpha)
+    elements = [ring.element(InvertedInteger, x) for x in values]
+
+    def run():
+        acc = elements[0]
+        for x in elements:
+            acc = acc * x
+    return run
+
+
+def _naive_power(value, exponent, n, alpha):
+    # the power of ringContext.power before the context held α^-1: one pow mod α n
+    reduced = alpha * n
+    return (1 - pow(1 - alpha * value, exponent, reduced)) % reduced // alpha
+
+
+def cases(quick=False, engines=None):
+    """Yields (name, params, func) for every benchmark case."""
+    sizes = QUICK_SIZES if quick else SIZES
+    pairs_max = QUICK_PAIRS_MAX if quick else PAIRS_MAX
+    engines = list(invertedInteger.ENGINES) if engines is None else engines
+
+    for n in sizes[1]:
+        yield "element_mul", {"n": n}, _element_loop(n, lambda x, y: x * y)
+        yield "element_add", {"n": n}, _element_loop(n, lambda x, y: x + y)
+        yield "iterate", {"n": n}, lambda n=n: list(InvertedIntegers(n, _alpha(n)))
+        generators = {InvertedInteger(x, n, _alpha(n)) for x in (2, 3)}
+        yield "multiplicative_span", {"n": n}, lambda generators=generators: multiplicative_span(generators)
+        yield "inverted_roots_of_unity", {"n": n, "engine": "python"}, \
+            lambda n=n: inverted_roots_of_unity(n, _alpha(n))
+        for engine in ROOT_ENGINES:
+            if engine != "python":
+                yield "inverted_roots_of_unity", {"n": n, "engine": engine}, \
+                    lambda n=n, engine=engine: ROOT_ENGINES[engine]([(n, _alpha(n))])
+
+    # import of the entry modules in a fresh interpreter, including its startup
+    for module in IMPORT_MODULES:
+        yield "import", {"module": module}, lambda module=module: import_time(module)
+
+    # big moduli: ⊗ and powers on plain integers against InvertedInteger elements of a ring context
+    for bits in QUICK_BIG_BITS if quick else BIG_BITS:
+        n, alpha, values = _big_ring(bits)
+        yield "big_mul", {"bits": bits, "path": "naive"}, _naive_mul_loop(n, alpha, values)
+        yield "big_mul", {"bits": bits, "path": "context"}, _context_mul_loop(n, alpha, values)
+        exponent = values[1]
+        yield "big_power", {"bits": bits, "path": "naive"}, \
+            lambda n=n, alpha=alpha, x=values[0], k=exponent: _naive_power(x, k, n, alpha)
+        yield "big_power", {"bits": bits, "path": "context"}, \
+            lambda x=ring_context(n, alpha).element(InvertedInteger, values[0]), k=exponent: x ** k
+
+    for prop, (checker_name, degree) in invertedInteger.PROPERTIES.items():
+        for engine in engines:
+            # only benchmark engines that implement the property themselves
+            if invertedInteger.resolve_engine(prop, engine) != engine:
+                continue
+            checker = invertedInteger.get_checker(prop, engine)
+            for n in sizes[degree]:
+                yield "check:" + prop, {"n": n, "engine": engine}, \
+                    _cold(lambda n=n, checker=checker: checker(n, _alpha(n)))
+            max = pairs_max[degree]
+            pairs = PAIRS_FUNCTIONS[prop]
+            yield "pairs:" + prop, {"max": max, "engine": engine}, \
+                _cold(lambda max=max, pairs=pairs, engine=engine: pairs(max, engine=engine))
+
+
+def measure(func, repeat=REPEAT, min_time=MIN_TIME, warmup=1):
+    """
+    Times func with time.perf_counter after warmup calls.
+
+    The number of calls per timing is doubled until one timing lasts at
+    least min_time, then repeat timings are taken. Times are per call.
+    """
+    for _ in range(warmup):
+        func()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {"best": min(timings), "median": statistics.median(timings), "mean": statistics.mean(timings),
+            "number": number, "repeat": repeat}
+
+
+def run(quick=False, engines=None, select=None, repeat=REPEAT, min_time=MIN_TIME):
+    """Runs the benchmarks whose name contains select (all by default) and returns the report."""
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    results = []
+    for name, params, func in cases(quick, engines):
+        if select is not None and select not in name:
+            continue
+        results.append(dict(name=name, params=params, **measure(func, repeat, min_time)))
+    return {
+        "meta": {"python": platform.python_version(), "numpy": numpy_version, "platform": platform.platform(),
+                 "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+def _key(result):
+    return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+
+def compare(baseline, current, threshold=THRESHOLD):
+    """
+    Returns the rows (name, params, baseline median, current median, ratio, regressed)
+    of the cases present in both reports.
+    """
+    previous = {_key(result): result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        old = previous.get(_key(result))
+        if old is None:
+            continue
+        ratio = result["median"] / old["median"] if old["median"] else float("inf")
+        rows.append((result["name"], result["params"], old["median"], result["median"], ratio,
+                     ratio > 1 + threshold))
+    return rows
+
+
+def print_report(report):
+    for result in report["results"]:
+        params = ", ".join(f"{key}={value}" for key, value in result["params"].items())
+        print(f"{result['name']:40} {params:30} {result['median'] * 1e6:12.1f} us")
+
+
+def print_comparison(rows):
+    for name, params, old, new, ratio, regressed in rows:
+        params = ", ".join(f"{key}={value}" for key, value in params.items())
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:40} {params:30} {old * 1e6:12.1f} us {new * 1e6:12.1f} us {ratio:6.2f}x {flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", help="write the JSON report to this file")
+    run_parser.add_argument("--quick", action="store_true", help="use the small quick sizes")
+    run_parser.add_argument("--engine", action="append", help="only benchmark this engine (repeatable)")
+    run_parser.add_argument("--select", help="only run cases whose name contains this string")
+    run_parser.add_argument("--repeat", type=int, default=REPEAT)
+    run_parser.add_argument("--compare", help="baseline JSON report to compare against")
+    run_parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    compare_parser = commands.add_parser("compare", help="compare two JSON reports")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run(args.quick, args.engine, args.select, args.repeat)
+        print_report(report)
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(report, file, indent=2)
+        if not args.compare:
+            return 0
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        current = report
+    else:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        with open(args.current) as file:
+            current = json.load(file)
+
+    rows = compare(baseline, current, args.threshold)
+    print_comparison(rows)
+    return 1 if any(row[-1] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Cayley-table engine for the inverted integer property checkers.
+
+The ⊗ and ⊕ tables for a given (n, alpha) are built once and every axiom is
+then checked with table lookups, e.g. T[T[x, y], z] == T[x, T[y, z]], instead
+of re-evaluating the formulas with % n on every step. NumPy is used when it
+is installed; otherwise the tables are plain lists and the same checks run
+as Python loops over them.
+
+check_property(prop, n, alpha) returns the same booleans as the checkers
+in invertedInteger.py, so this module can be used as a drop-in engine. It
+reads its tables from the active tableCache.TableCache when there is one.
+"""
+import tableCache
+from ringContext import add, multiply
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Upper bound on the number of entries in one broadcast block of a cubic check
+BLOCK_SIZE = 1 << 22
+
+
+def table_dtype(n):
+    """Returns the smallest unsigned NumPy dtype that can hold the values of Zn."""
+    if n <= 1 << 8:
+        return np.uint8
+    if n <= 1 << 16:
+        return np.uint16
+    if n <= 1 << 32:
+        return np.uint32
+    return np.uint64
+
+
+def multiplication_table(n, alpha):
+    """
+    Returns the n x n table of x ⊗ y = (x + y - alpha * x * y) mod n.
+
+    >>> [list(map(int, row)) for row in multiplication_table(3, 1)]
+    [[0, 1, 2], [1, 1, 1], [2, 1, 0]]
+    """
+    if np is None:
+        return [[multiply(x, y, n, alpha) for y in range(n)] for x in range(n)]
+    x = np.arange(n, dtype=np.int64)
+    return multiply(x[:, None], x[None, :], n, alpha).astype(table_dtype(n))
+
+
+def addition_table(n, alpha):
+    """
+    Returns the n x n table of x ⊕ y = (x - y) mod n.
+
+    >>> [list(map(int, row)) for row in addition_table(3, 1)]
+    [[0, 2, 1], [1, 0, 2], [2, 1, 0]]
+    """
+    if np is None:
+        return [[add(x, y, n) for y in range(n)] for x in range(n)]
+    x = np.arange(n, dtype=np.int64)
+    return add(x[:, None], x[None, :], n).astype(table_dtype(n))
+
+
+def cached_multiplication_table(n, alpha):
+    """Returns multiplication_table(n, alpha), memory-mapped from the active table cache if any."""
+    cache = tableCache.active()
+    if cache is None:
+        return multiplication_table(n, alpha)
+    return cache.get("mul", n, alpha, multiplication_table)
+
+
+def cached_addition_table(n, alpha):
+    """Returns addition_table(n, alpha), memory-mapped from the active table cache if any."""
+    cache = tableCache.active()
+    if cache is None:
+        return addition_table(n, alpha)
+    # ⊕ does not depend on alpha, so one table serves every alpha
+    return cache.get("add", n, 0, addition_table)
+
+
+def _blocks(n):
+    """Splits range(n) into blocks of rows whose n x n slabs fit in BLOCK_SIZE."""
+    step = max(1, BLOCK_SIZE // max(1, n * n))
+    for start in range(0, n, step):
+        yield slice(start, min(start + step, n))
+
+
+def is_idempotent(table):
+    """Checks x ⊗ x = x for every x, reading the diagonal of the table."""
+    if np is None:
+        return all(row[x] == x for x, row in enumerate(table))
+    return bool(np.array_equal(np.diagonal(table), np.arange(len(table))))
+
+
+def is_commutative(table):
+    """Checks that the table is symmetric."""
+    if np is None:
+        return all(table[x][y] == table[y][x] for x in range(len(table)) for y in range(x, len(table)))
+    return bool(np.array_equal(table, table.T))
+
+
+def is_associative(table):
+    """Checks T[T[x, y], z] == T[x, T[y, z]] for every triple."""
+    n = len(table)
+    if np is None:
+        for row in table:
+            for y in range(n):
+                left = table[row[y]]
+                for z in range(n):
+                    if left[z] != row[table[y][z]]:
+                        return False
+        return True
+    for rows in _blocks(n):
+        # left[x, y, z] = T[T[x, y], z] and right[x, y, z] = T[x, T[y, z]]
+        left = table[table[rows]]
+        right = table[rows][:, table]
+        if not np.array_equal(left, right):
+            return False
+    return True
+
+
+def is_right_distributive(mul, add):
+    """Checks (x ⊕ y) ⊗ z == (x ⊗ z) ⊕ (y ⊗ z) for every triple."""
+    n = len(mul)
+    if np is None:
+        for x in range(n):
+            for y in range(n):
+                left = mul[add[x][y]]
+                for z in range(n):
+                    if left[z] != add[mul[x][z]][mul[y][z]]:
+                        return False
+        return True
+    for rows in _blocks(n):
+        # left[x, y, z] = M[A[x, y], z] and right[x, y, z] = A[M[x, z], M[y, z]]
+        left = mul[add[rows]]
+        right = add[mul[rows][:, None, :], mul[None, :, :]]
+        if not np.array_equal(left, right):
+            return False
+    return True
+
+
+def is_left_distributive(mul, add):
+    """Checks z ⊗ (x ⊕ y) == (z ⊗ x) ⊕ (z ⊗ y) for every triple."""
+    n = len(mul)
+    if np is None:
+        for z in range(n):
+            row = mul[z]
+            for x in range(n):
+                left = add[x]
+                for y in range(n):
+                    if row[left[y]] != add[row[x]][row[y]]:
+                        return False
+        return True
+    for rows in _blocks(n):
+        # left[z, x, y] = M[z, A[x, y]] and right[z, x, y] = A[M[z, x], M[z, y]]
+        left = mul[rows][:, add]
+        right = add[mul[rows][:, :, None], mul[rows][:, None, :]]
+        if not np.array_equal(left, right):
+            return False
+    return True
+
+
+# property -> (check of Cayley tables, operations whose tables it takes: "mul" for ⊗, "add" for ⊕)
+TABLE_CHECKS = {
+    "idempotent": (is_idempotent, ("mul",)),
+    "commutative_multiplication": (is_commutative, ("mul",)),
+    "commutative_addition": (is_commutative, ("add",)),
+    "associative_multiplication": (is_associative, ("mul",)),
+    "associative_addition": (is_associative, ("add",)),
+    "right_distributivity": (is_right_distributive, ("mul", "add")),
+    "left_distributivity": (is_left_distributive, ("mul", "add")),
+}
+
+
+def check_tables(prop, table):
+    """Checks a property on the Cayley tables returned by table(operation), for operation "mul" or "add"."""
+    check, operations = TABLE_CHECKS[prop]
+    return check(*(table(operation) for operation in operations))
+
+
+def check_property(prop, n, alpha):
+    """
+    Checks a property of (Zn, alpha) on its Cayley tables.
+
+    >>> check_property("associative_multiplication", 6, 4), check_property("commutative_addition", 6, 4)
+    (True, False)
+    """
+    tables = {"mul": cached_multiplication_table, "add": cached_addition_table}
+    return check_tables(prop, lambda operation: tables[operation](n, alpha))
@@ -0,0 +1,203 @@
+"""
+Fused evaluation of several properties of (Zn, alpha) in one traversal.
+
+Checking every property with its own has_* function rebuilds the ⊗ and ⊕
+values and rescans the triples once per property. classify() builds the
+⊗ and ⊕ tables once and walks the triples (x, y, z) a single time. Without
+NumPy it is one nested loop feeding the shared products x ⊗ y, x ⊕ y, ...
+to every requested check. With NumPy it walks blocks of rows of x: the
+row gathers x ⊗ y, x ⊕ y and y ⊗ x of a block are taken once and shared
+by every check, and checks of the same identity (left and right
+distributivity when ⊗ is commutative) share one comparison. A check
+stops as soon as it finds a counterexample, and the walk stops once every
+requested property has failed.
+
+The result is a bitmask with the bit BITS[prop] set for every requested
+property that holds, plus, if asked for, a counterexample for each one
+that does not, as the same (x,), (x, y) or (x, y, z) tuples as
+counterexamples.py returns.
+
+    >>> result = classify(4, 3, witnesses=True)
+    >>> names(result.mask)
+    ['commutative_multiplication', 'associative_multiplication']
+    >>> result.witnesses["commutative_addition"], result.witnesses["left_distributivity"]
+    ((0, 1), (0, 0, 1))
+"""
+import collections
+import functools
+
+import cayleyTable
+import sweep
+from invertedInteger import PROPERTIES
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# property -> bit of the classification mask
+BITS = {prop: 1 << i for i, prop in enumerate(PROPERTIES)}
+
+# mask requesting every property
+ALL = (1 << len(BITS)) - 1
+
+# mask: bits of the properties that hold; witnesses: {property: counterexample} for the
+# requested properties that fail, or None when witnesses were not requested
+Classification = collections.namedtuple("Classification", "mask witnesses")
+
+
+def names(mask):
+    """Returns the names of the properties whose bits are set in mask, in PROPERTIES order."""
+    return [prop for prop, bit in BITS.items() if mask & bit]
+
+
+def _mask(props):
+    """Returns the mask of props, given as a mask or an iterable of property names."""
+    if props is None:
+        return ALL
+    if isinstance(props, int):
+        return props & ALL
+    mask = 0
+    for prop in props:
+        if prop not in BITS:
+            raise ValueError("Unknown property: " + str(prop))
+        mask |= BITS[prop]
+    return mask
+
+
+def _classify_lists(n, alpha, mask):
+    """Walks the triples in one nested loop over list tables; returns {failed property: witness}."""
+    mul = cayleyTable.cached_multiplication_table(n, alpha)
+    add = cayleyTable.cached_addition_table(n, alpha)
+    failed = {}
+    if mask & BITS["idempotent"]:
+        for x in range(n):
+            if mul[x][x] != x:
+                failed["idempotent"] = (x,)
+                break
+    quadratic = [prop for prop in ("commutative_multiplication", "commutative_addition") if mask & BITS[prop]]
+    for x in range(n):
+        if not quadratic:
+            break
+        for y in range(x, n):
+            for prop in list(quadratic):
+                table = mul if prop == "commutative_multiplication" else add
+                if table[x][y] != table[y][x]:
+                    failed[prop] = (x, y)
+                    quadratic.remove(prop)
+    cubic = [prop for prop in ("associative_multiplication", "associative_addition", "right_distributivity",
+                               "left_distributivity") if mask & BITS[prop]]
+    for x in range(n):
+        if not cubic:
+            break
+        mul_x, add_x = mul[x], add[x]
+        for y in range(n):
+            if not cubic:
+                break
+            # rows of the tables at the products x ⊗ y and x ⊕ y, shared by every z
+            mul_at_mul_xy, add_at_add_xy, mul_at_add_xy = mul[mul_x[y]], add[add_x[y]], mul[add_x[y]]
+            mul_y, add_y, add_xy = mul[y], add[y], add_x[y]
+            for z in range(n):
+                for prop in list(cubic):
+                    if prop == "associative_multiplication":
+                        holds = mul_at_mul_xy[z] == mul_x[mul_y[z]]
+                    elif prop == "associative_addition":
+                        holds = add_at_add_xy[z] == add_x[add_y[z]]
+                    elif prop == "right_distributivity":
+                        holds = mul_at_add_xy[z] == add[mul_x[z]][mul_y[z]]
+                    else:
+                        mul_z = mul[z]
+                        holds = mul_z[add_xy] == add[mul_z[x]][mul_z[y]]
+                    if not holds:
+                        failed[prop] = (x, y, z)
+                        cubic.remove(prop)
+    return failed
+
+
+def _first(mismatch, offset=0):
+    """Returns the first (x, ...) in row-major order where mismatch is True, shifting x by offset."""
+    index = np.unravel_index(int(np.argmax(mismatch)), mismatch.shape)
+    return (int(index[0]) + offset,) + tuple(int(i) for i in index[1:])
+
+
+def _classify_arrays(n, alpha, mask):
+    """Checks blocks of rows of x against NumPy tables; returns {failed property: witness}."""
+    mul = np.asarray(cayleyTable.cached_multiplication_table(n, alpha))
+    add = np.asarray(cayleyTable.cached_addition_table(n, alpha))
+    failed = {}
+    if mask & BITS["idempotent"]:
+        mismatch = np.diagonal(mul) != np.arange(n)
+        if mismatch.any():
+            failed["idempotent"] = _first(mismatch)
+    for prop, table in (("commutative_multiplication", mul), ("commutative_addition", add)):
+        if mask & BITS[prop]:
+            # a mismatch at (x, y) is one at (y, x) too, so the first one has x <= y
+            mismatch = table != table.T
+            if mismatch.any():
+                failed[prop] = _first(mismatch)
+    cubic = [prop for prop in ("associative_multiplication", "associative_addition", "right_distributivity",
+                               "left_distributivity") if mask & BITS[prop]]
+    # the identity checked by each property, named by its two sides; when ⊗ is commutative
+    # z ⊗ (x ⊕ y) = (x ⊕ y) ⊗ z and (z ⊗ x) ⊕ (z ⊗ y) = (x ⊗ z) ⊕ (y ⊗ z), so left distributivity
+    # is right distributivity and shares its comparison
+    identities = {"associative_multiplication": ("(x*y)*z", "x*(y*z)"),
+                  "associative_addition": ("(x+y)+z", "x+(y+z)"),
+                  "right_distributivity": ("(x+y)*z", "(x*z)+(y*z)"),
+                  "left_distributivity": ("z*(x+y)", "(z*x)+(z*y)")}
+    if "left_distributivity" in cubic and np.array_equal(mul, mul.T):
+        identities["left_distributivity"] = identities["right_distributivity"]
+    transposed = mul.T
+    for rows in cayleyTable._blocks(n):
+        if not cubic:
+            break
+        # gathers shared by the checks, indexed [x, y] for the x in rows: x ⊗ y, x ⊕ y and y ⊗ x
+        mul_rows, add_rows, transposed_rows = mul[rows], add[rows], transposed[rows]
+        # side -> function computing it, indexed [x, y, z]
+        sides = {"(x*y)*z": lambda: mul[mul_rows],
+                 "x*(y*z)": lambda: mul_rows[:, mul],
+                 "(x+y)+z": lambda: add[add_rows],
+                 "x+(y+z)": lambda: add_rows[:, add],
+                 "(x+y)*z": lambda: mul[add_rows],
+                 "(x*z)+(y*z)": lambda: add[mul_rows[:, None, :], mul[None, :, :]],
+                 "z*(x+y)": lambda: transposed[add_rows],
+                 "(z*x)+(z*y)": lambda: add[transposed_rows[:, None, :], transposed[None, :, :]]}
+        # identity -> its mismatch array in this block, computed once for every property checking it
+        mismatches = {}
+        for prop in list(cubic):
+            identity = identities[prop]
+            if identity not in mismatches:
+                left, right = identity
+                mismatches[identity] = sides[left]() != sides[right]()
+            mismatch = mismatches[identity]
+            if mismatch.any():
+                failed[prop] = _first(mismatch, rows.start)
+                cubic.remove(prop)
+    return failed
+
+
+def classify(n, alpha, props=None, witnesses=False):
+    """
+    Evaluates the requested properties of (Zn, alpha) in one traversal and returns a Classification.
+
+    props is a mask of BITS or an iterable of property names (all properties by default).
+    """
+    mask = _mask(props)
+    if n <= 0:
+        raise ValueError("Modulus must be positive.")
+    if not (0 <= alpha < n):
+        raise ValueError("Multiplier must be between 0 and modulus-1")
+    failed = _classify_lists(n, alpha, mask) if np is None else _classify_arrays(n, alpha, mask)
+    for prop in failed:
+        mask &= ~BITS[prop]
+    return Classification(mask, failed if witnesses else None)
+
+
+def classify_range(max, props=None, witnesses=False, workers=None):
+    """Returns {(n, alpha): classify(n, alpha, props, witnesses)} for 1 <= n <= max, 0 <= alpha < n."""
+    tasks = sweep.grid(max)
+    func = functools.partial(classify, props=props, witnesses=witnesses)
+    if workers is None:
+        results = [func(n, alpha) for n, alpha in tasks]
+    else:
+        results = sweep.parallel_map(func, tasks, [n ** 3 for n, alpha in tasks], workers)
+    return dict(zip(tasks, results))
@@ -0,0 +1,171 @@
+"""
+Counterexample-returning checkers for the inverted integer properties.
+
+Instead of True/False, each find_* function returns the first witness it
+finds, i.e. a tuple (x,), (x, y) or (x, y, z) that violates the property,
+or None if the property holds. Failures usually show up at small or
+structurally interesting elements, so the candidates are tried in this
+order before falling back to the exhaustive lexicographic scan:
+
+    1. a seeded random sample of tuples,
+    2. tuples built from a generating set of (Zn, ⊗),
+    3. tuples built from interesting elements (0, 1, 2, n - 1, alpha, ...),
+    4. every tuple of Zn.
+
+check_property at the bottom makes this module usable as the "search"
+engine of invertedInteger.py.
+"""
+import itertools
+import random
+
+from lightTest import generating_set
+from ringContext import add, multiply
+
+# Number of random tuples tried before the structured candidates
+SAMPLES = 64
+
+# Number of generators of (Zn, ⊗) whose tuples are tried after the random sample
+GENERATORS = 6
+
+
+def _violates_idempotent(n, alpha, x):
+    return multiply(x, x, n, alpha) != x
+
+
+def _violates_commutative_multiplication(n, alpha, x, y):
+    return multiply(x, y, n, alpha) != multiply(y, x, n, alpha)
+
+
+def _violates_commutative_addition(n, alpha, x, y):
+    return add(x, y, n) != add(y, x, n)
+
+
+def _violates_associative_multiplication(n, alpha, x, y, z):
+    return multiply(multiply(x, y, n, alpha), z, n, alpha) != multiply(x, multiply(y, z, n, alpha), n, alpha)
+
+
+def _violates_associative_addition(n, alpha, x, y, z):
+    return add(add(x, y, n), z, n) != add(x, add(y, z, n), n)
+
+
+def _violates_right_distributivity(n, alpha, x, y, z):
+    return multiply(add(x, y, n), z, n, alpha) != add(multiply(x, z, n, alpha), multiply(y, z, n, alpha), n)
+
+
+def _violates_left_distributivity(n, alpha, x, y, z):
+    return multiply(z, add(x, y, n), n, alpha) != add(multiply(z, x, n, alpha), multiply(z, y, n, alpha), n)
+
+
+# property name -> (number of variables, predicate that is True on a violation)
+VIOLATIONS = {
+    "idempotent": (1, _violates_idempotent),
+    "commutative_multiplication": (2, _violates_commutative_multiplication),
+    "commutative_addition": (2, _violates_commutative_addition),
+    "associative_multiplication": (3, _violates_associative_multiplication),
+    "associative_addition": (3, _violates_associative_addition),
+    "right_distributivity": (3, _violates_right_distributivity),
+    "left_distributivity": (3, _violates_left_distributivity),
+}
+
+
+def interesting_elements(n, alpha):
+    """
+    Returns the elements of Zn most likely to expose a failure, without repeats.
+
+    >>> interesting_elements(7, 2)
+    [1, 2, 6, 0, 4, 3, 5]
+    >>> interesting_elements(1, 0)
+    [0]
+    """
+    candidates = [1, 2, n - 1, 0, alpha]
+    # the ⊗-zero 1 / alpha, when alpha is a unit
+    try:
+        candidates.append(pow(alpha, -1, n))
+    except ValueError:
+        pass
+    candidates += [n // 2, n - 2]
+    elements = []
+    for x in candidates:
+        x %= n
+        if x not in elements:
+            elements.append(x)
+    return elements
+
+
+def candidates(n, alpha, arity, samples=SAMPLES, seed=0):
+    """Yields the tuples of Zn to try, in search order (may contain repeats)."""
+    rng = random.Random(seed)
+    for _ in range(samples if n > 1 else 0):
+        yield tuple(rng.randrange(n) for _ in range(arity))
+    # every element is a product of the generators, so a failing identity usually already fails on
+    # them, and for associativity some (x, g, z) with g a generator fails (see lightTest.py)
+    yield from itertools.product(generating_set(n, alpha, max_generators=n)[:GENERATORS], repeat=arity)
+    yield from itertools.product(interesting_elements(n, alpha), repeat=arity)
+    yield from itertools.product(range(n), repeat=arity)
+
+
+def find_counterexample(prop, n, alpha, samples=SAMPLES, seed=0):
+    """
+    Returns a tuple of elements of Zn violating the property, or None if it holds.
+
+    >>> find_counterexample("commutative_addition", 5, 2)
+    (0, 2)
+    >>> find_counterexample("associative_multiplication", 5, 2) is None
+    True
+    """
+    if prop not in VIOLATIONS:
+        raise ValueError("Unknown property: " + str(prop))
+    arity, violates = VIOLATIONS[prop]
+    for witness in candidates(n, alpha, arity, samples, seed):
+        if violates(n, alpha, *witness):
+            return witness
+    return None
+
+
+def find_idempotent_counterexample(n, alpha, samples=SAMPLES, seed=0):
+    return find_counterexample("idempotent", n, alpha, samples, seed)
+
+
+def find_commutative_multiplication_counterexample(n, alpha, samples=SAMPLES, seed=0):
+    return find_counterexample("commutative_multiplication", n, alpha, samples, seed)
+
+
+def find_commutative_addition_counterexample(n, alpha, samples=SAMPLES, seed=0):
+    return find_counterexample("commutative_addition", n, alpha, samples, seed)
+
+
+def find_associative_multiplication_counterexample(n, alpha, samples=SAMPLES, seed=0):
+    return find_counterexample("associative_multiplication", n, alpha, samples, seed)
+
+
+def find_associative_addition_counterexample(n, alpha, samples=SAMPLES, seed=0):
+    return find_counterexample("associative_addition", n, alpha, samples, seed)
+
+
+def find_right_distributivity_counterexample(n, alpha, samples=SAMPLES, seed=0):
+    return find_counterexample("right_distributivity", n, alpha, samples, seed)
+
+
+def find_left_distributivity_counterexample(n, alpha, samples=SAMPLES, seed=0):
+    return find_counterexample("left_distributivity", n, alpha, samples, seed)
+
+
+def counterexample_pairs(prop, max, samples=SAMPLES, seed=0):
+    """
+    Returns {(n, alpha): witness} for every pair with 1 <= n <= max that fails the property.
+
+    >>> counterexample_pairs("idempotent", 2)
+    {(2, 0): (1,)}
+    """
+    failures = {}
+    for n in range(1, max + 1):
+        for alpha in range(n):
+            witness = find_counterexample(prop, n, alpha, samples, seed)
+            if witness is not None:
+                failures[(n, alpha)] = witness
+    return failures
+
+
+def check_property(prop, n, alpha):
+    """Checks a property of (Zn, alpha) by searching for a counterexample."""
+    return find_counterexample(prop, n, alpha) is None
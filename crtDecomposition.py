@@ -0,0 +1,77 @@
+"""
+CRT-decomposed property checking for composite moduli.
+
+By the Chinese Remainder Theorem, Zn is the direct product of the rings
+Z(p^k) over the prime powers p^k exactly dividing n, and both x ⊗ y and
+x ⊕ y are computed componentwise (with multiplier alpha mod p^k). Every
+property checked in invertedInteger.py is an identity, and an identity
+holds in a direct product exactly when it holds in every factor. So a
+property holds for (n, alpha) iff it holds for every (p^k, alpha mod p^k).
+
+The prime power results of the CACHE_SIZE most recent components are
+memoised, so a sweep up to N mostly reuses answers computed for smaller
+moduli.
+"""
+import functools
+
+import invertedInteger
+
+# Engine used to check the prime power components
+BASE_ENGINE = "table"
+
+# Number of factorisations and of component results memoised; the least recently used are
+# dropped, so long sweeps keep a bounded memo while the small prime powers they share stay in it
+CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def factorize(n):
+    """
+    Returns the prime factorisation of n as a tuple of (p, k) pairs.
+
+    >>> factorize(360)
+    ((2, 3), (3, 2), (5, 1))
+    >>> factorize(1)
+    ()
+    """
+    factors = []
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            k = 0
+            while n % p == 0:
+                n //= p
+                k += 1
+            factors.append((p, k))
+        p += 1 if p == 2 else 2
+    if n > 1:
+        factors.append((n, 1))
+    return tuple(factors)
+
+
+def prime_power_factors(n):
+    """
+    Returns the prime powers p^k exactly dividing n.
+
+    >>> prime_power_factors(360)
+    [8, 9, 5]
+    """
+    return [p ** k for p, k in factorize(n)]
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def check_component(prop, q, alpha, engine=BASE_ENGINE):
+    """Checks a property on the prime power component (Zq, alpha), memoised."""
+    return invertedInteger.check_property(prop, q, alpha, engine)
+
+
+def check_property(prop, n, alpha, engine=BASE_ENGINE):
+    """
+    Checks a property of (Zn, alpha) on each of its prime power components.
+
+    >>> check_property("commutative_addition", 6, 1)
+    False
+    >>> check_property("associative_multiplication", 12, 5)
+    True
+    """
+    return all(check_component(prop, q, alpha % q, engine) for q in prime_power_factors(n))
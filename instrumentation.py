@@ -0,0 +1,192 @@
+"""
+Opt-in instrumentation for the checkers, sweeps and spans.
+
+While a Recorder is active, the has_* checkers in invertedInteger.py and
+multiplicative_span in multiplicativeSpan.py record one entry per call with
+the number of evaluations, the position of an early exit, the number of
+objects allocated and the wall time. The *_pairs sweeps record the wall
+time of every (n, alpha) and report progress to an optional callback.
+Sweeps run with workers check each pair under a Recorder of the worker
+and send its measurements back, so they are merged into the same report;
+the cProfile profile only covers the calling process.
+When no Recorder is active, each instrumented call costs one global lookup.
+
+A Recorder is activated with the instrument() context manager, or for the
+whole process by setting the INVERTED_INTEGER_INSTRUMENT environment
+variable to a path (the JSON report is written there at exit) or to "1"
+(the text report is printed to stderr at exit).
+
+    >>> from invertedInteger import has_inverted_right_distributivity
+    >>> with instrument() as recorder:
+    ...     has_inverted_right_distributivity(5, 2)
+    False
+    >>> call = recorder.calls[0]
+    >>> call["function"], call["evaluations"], call["exit_at"]
+    ('has_inverted_right_distributivity', 2, (0, 0, 1))
+"""
+import atexit
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import sys
+import time
+
+# The active Recorder, or None when instrumentation is disabled
+_recorder = None
+
+
+class Recorder:
+    """
+    Collects per-call and per-(n, alpha) measurements.
+
+    progress, if given, is called as progress(done, total, pair) while a
+    sweep runs. With profile=True a cProfile.Profile runs while the
+    recorder is active and can be saved with dump_stats.
+    """
+
+    def __init__(self, progress=None, profile=False):
+        self.progress = progress
+        self.profiler = cProfile.Profile() if profile else None
+        self.calls = []
+        self.pairs = []
+        self.exit_position = None
+
+    def record_call(self, function, n, alpha, seconds, evaluations, exit_at=None, allocated=0):
+        self.calls.append({"function": function, "n": n, "alpha": alpha, "seconds": seconds,
+                           "evaluations": evaluations, "exit_at": exit_at, "allocated": allocated})
+
+    def record_pair(self, prop, engine, n, alpha, seconds):
+        self.pairs.append({"property": prop, "engine": engine, "n": n, "alpha": alpha, "seconds": seconds})
+
+    def summary(self):
+        """Returns {function: {calls, evaluations, allocated, seconds, slowest (n, alpha)}}."""
+        summary = {}
+        for call in self.calls:
+            entry = summary.setdefault(call["function"], {"calls": 0, "evaluations": 0, "allocated": 0,
+                                                          "seconds": 0.0, "slowest": None, "slowest_seconds": 0.0})
+            entry["calls"] += 1
+            entry["evaluations"] += call["evaluations"]
+            entry["allocated"] += call["allocated"]
+            entry["seconds"] += call["seconds"]
+            if call["seconds"] >= entry["slowest_seconds"]:
+                entry["slowest"] = (call["n"], call["alpha"])
+                entry["slowest_seconds"] = call["seconds"]
+        return summary
+
+    def report(self):
+        """Returns the measurements as a JSON-serialisable dict."""
+        return {"summary": self.summary(), "calls": self.calls, "pairs": self.pairs}
+
+    def write(self, path):
+        """Writes the JSON report to path."""
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2)
+
+    def format(self, top=10):
+        """Returns a text report with the per-function totals and the slowest (n, alpha) pairs."""
+        lines = [f"{'function':45} {'calls':>8} {'evaluations':>14} {'allocated':>10} {'seconds':>10}"]
+        for function, entry in sorted(self.summary().items()):
+            lines.append(f"{function:45} {entry['calls']:8} {entry['evaluations']:14} "
+                         f"{entry['allocated']:10} {entry['seconds']:10.4f}")
+        if self.pairs:
+            lines.append("")
+            lines.append("slowest (n, alpha) in sweeps:")
+            for pair in sorted(self.pairs, key=lambda pair: pair["seconds"], reverse=True)[:top]:
+                lines.append(f"  {pair['property']:30} {pair['engine']:8} n={pair['n']:<6} "
+                             f"alpha={pair['alpha']:<6} {pair['seconds']:.6f}s")
+        return "\n".join(lines)
+
+    def dump_stats(self, path):
+        """Writes the cProfile data to path, readable with pstats or snakeviz."""
+        if self.profiler is None:
+            raise ValueError("Recorder was created without profile=True")
+        self.profiler.dump_stats(path)
+
+
+def active():
+    """Returns the active Recorder, or None when instrumentation is disabled."""
+    return _recorder
+
+
+@contextlib.contextmanager
+def instrument(progress=None, profile=False):
+    """Activates a new Recorder for the duration of the with block and yields it."""
+    global _recorder
+    previous = _recorder
+    recorder = Recorder(progress, profile)
+    _recorder = recorder
+    if recorder.profiler is not None:
+        recorder.profiler.enable()
+    try:
+        yield recorder
+    finally:
+        if recorder.profiler is not None:
+            recorder.profiler.disable()
+        _recorder = previous
+
+
+def note_exit(*position):
+    """Called by a checker just before an early exit at position."""
+    if _recorder is not None:
+        _recorder.exit_position = position
+
+
+def progress(done, total, pair=None):
+    """Reports sweep progress to the active Recorder's callback."""
+    if _recorder is not None and _recorder.progress is not None:
+        _recorder.progress(done, total, pair)
+
+
+# evaluation counts of the checker loops, given n and the early exit position (None for a full scan)
+
+def linear_count(n, position):
+    return n if position is None else position[0] + 1
+
+
+def triangular_count(n, position):
+    """Loops over x in range(n), y in range(x, n)."""
+    if position is None:
+        return n * (n + 1) // 2
+    x, y = position
+    return x * n - x * (x - 1) // 2 + (y - x) + 1
+
+
+def cubic_count(n, position):
+    if position is None:
+        return n ** 3
+    x, y, z = position
+    return (x * n + y) * n + z + 1
+
+
+def instrumented(count):
+    """Decorates a checker f(n, alpha) so it is recorded while a Recorder is active."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(n, alpha):
+            recorder = _recorder
+            if recorder is None:
+                return function(n, alpha)
+            recorder.exit_position = None
+            start = time.perf_counter()
+            result = function(n, alpha)
+            seconds = time.perf_counter() - start
+            position = recorder.exit_position
+            recorder.exit_position = None
+            recorder.record_call(function.__name__, n, alpha, seconds, count(n, position), position)
+            return result
+        return wrapper
+    return decorate
+
+
+def _write_environment_report(recorder, target):
+    if target in ("1", "stderr"):
+        print(recorder.format(), file=sys.stderr)
+    else:
+        recorder.write(target)
+
+
+if os.environ.get("INVERTED_INTEGER_INSTRUMENT"):
+    _recorder = Recorder()
+    atexit.register(_write_environment_report, _recorder, os.environ["INVERTED_INTEGER_INSTRUMENT"])
@@ -1,110 +1,81 @@
-class InvertedInteger:
+import functools
+import importlib
+import itertools
+import time
+
+import instrumentation
+import sweep
+from ringContext import InvertedIntegerBase
+
+# elements share a cached ring context per (n, alpha) and are interned, see ringContext.py
+class InvertedInteger(InvertedIntegerBase):
       # value - integer value in Zn
       # modulus - modulus n is a positive integer
       # multiplier - multiplier alpha in Zn
-      def __init__(self, value, modulus, multiplier):
-            # checks if arguments are valid
-            if modulus <= 0:
-                  raise ValueError("Modulus must be positive.")
-            if not (0 <= value < modulus):
-                  raise ValueError("Value must be between 0 and modulus-1")
-            if not (0 <= multiplier < modulus):
-                  raise ValueError("multiplier must be between 0 and modulus-1")
-            
-            # initialises values
-            self.value = value
-            self.modulus = modulus
-            self.multiplier = multiplier
+      # addition = (x - y) mod n and multiplication = (x + y - a * x * y) mod n
+      # are inherited from InvertedIntegerBase
+      __slots__ = ()
 
+      @property
+      def value(self):
+            return self._value
 
       # prints current instance of invertedInteger
       def __str__(self):
             return "<" + str(self.value) + " mod " + str(self.modulus) + " | " + str(self.multiplier) + " >"
 
-      # defines addition = (x - y) mod n
-      def __add__(self, other):
-            if not isinstance(other, InvertedInteger):
-                  raise TypeError("y must be of type InvertedInteger")
-            if (self.modulus != other.modulus) or (self.multiplier != other.multiplier):
-                  raise ValueError("Incompatible as modulus and multiplier must match")
-            
-            result = (self.value - other.value) % self.modulus
-            return InvertedInteger(result, self.modulus, self.multiplier)
-
-      # defines multiplication = (x + y - a * x * y) mod n
-      def __mul__(self, other):
-            if not isinstance(other, InvertedInteger):
-                  raise TypeError("y must be of type InvertedInteger")
-            if (self.modulus != other.modulus) or (self.multiplier != other.multiplier):
-                  raise ValueError("Incompatible as modulus and multiplier must match")
-
-            result = (self.value + other.value - self.multiplier * self.value * other.value) % self.modulus
-            return InvertedInteger(result, self.modulus, self.multiplier)
-      
       # checks if value values are equal
       def __eq__(self, other):
             if not isinstance(other, InvertedInteger):
                   raise TypeError("Values must be of type InvertedInteger")
 
-            return self.value == other.value and self.modulus == other.modulus and self.multiplier == other.multiplier
+            return InvertedIntegerBase.__eq__(self, other)
+
+      __hash__ = InvertedIntegerBase.__hash__
 
 # checks for idempotency x in Zn
+@instrumentation.instrumented(instrumentation.linear_count)
 def has_all_idempotents_property(n, alpha):
       for x in range(n):
             if ((x + x - alpha * x * x) % n) != x:
+                  instrumentation.note_exit(x)
                   return False
       return True
 
 # finds idempotent pairs
-def idempotent_pairs(max):
-      if 1 <= max <= 50:
-            pairs = []
-            for n in range(1, max+1):
-                  for alpha in range(n):
-                        if has_all_idempotents_property(n, alpha):
-                              pairs.append((n, alpha))
-            return pairs
-      raise ValueError("n must be between 1 and 50 inclusive")
+def idempotent_pairs(max, engine="python", workers=None, store=None):
+      return _pairs("idempotent", max, engine, True, workers, store)
 
 # checks for commutativity in multiplication
+@instrumentation.instrumented(instrumentation.triangular_count)
 def has_commutative_inverted_multiplication(n, alpha):
       for x in range(n):
             for y in range(x, n):   # starts from x to avoid redundant calculations
                   if ((x + y - alpha * x * y) % n) != ((y + x - alpha * y * x) % n):
+                        instrumentation.note_exit(x, y)
                         return False
       return True
 
 # checks for non commutative pairs
-def non_commutative_multiplication_pairs(max):
-      if 1 <= max <= 50:
-            pairs = []
-            for n in range(1, max+1):
-                  for alpha in range(n):
-                        if not has_commutative_inverted_multiplication(n, alpha):
-                              pairs.append((n, alpha))
-            return pairs
-      raise ValueError("n must be between 1 and 50 inclusive")
+def non_commutative_multiplication_pairs(max, engine="python", workers=None, store=None):
+      return _pairs("commutative_multiplication", max, engine, False, workers, store)
 
 # checks for commutativity in addition
+@instrumentation.instrumented(instrumentation.triangular_count)
 def has_commutative_inverted_addition(n, alpha):
       for x in range(n):
             for y in range(x, n):  # begins at x to skip redundant calculations
                   if ((x - y) % n) != ((y - x) % n):
+                        instrumentation.note_exit(x, y)
                         return False
       return True
 
 # finds commutative pairs in addition
-def commutative_addition_pairs(max):
-      if 1 <= max <= 50:
-            pairs = []
-            for n in range(1, max+1):
-                  for alpha in range(n):
-                        if not has_commutative_inverted_addition(n, alpha):
-                              pairs.append((n, alpha))
-            return pairs
-      raise ValueError("n must be between 1 and 50 inclusive")
+def commutative_addition_pairs(max, engine="python", workers=None, store=None):
+      return _pairs("commutative_addition", max, engine, False, workers, store)
 
 # checks for associativity in multiplication
+@instrumentation.instrumented(instrumentation.cubic_count)
 def has_associative_inverted_multiplication(n, alpha):
       for x in range(n):
             for y in range(n):
@@ -119,21 +90,16 @@ def has_associative_inverted_multiplication(n, alpha):
 
                         # checks if they equal
                         if l != r:
+                              instrumentation.note_exit(x, y, z)
                               return False
       return True
 
 # check for associative multiplication pairs
-def associative_multiplication_pairs(max):
-      if 1 <= max <= 20:
-            pairs = []
-            for n in range(1, max+1):
-                  for alpha in range(n):
-                        if has_associative_inverted_multiplication(n, alpha):
-                              pairs.append((n, alpha))
-            return pairs
-      raise ValueError("n must be between 1 and 20 inclusive")
+def associative_multiplication_pairs(max, engine="python", workers=None, store=None):
+      return _pairs("associative_multiplication", max, engine, True, workers, store)
 
 # checks for associativity in addition
+@instrumentation.instrumented(instrumentation.cubic_count)
 def has_associative_inverted_addition(n, alpha):
       for x in range(n):
             for y in range(n):
@@ -148,21 +114,16 @@ def has_associative_inverted_addition(n, alpha):
 
                         # checks if they equal
                         if l != r:
+                              instrumentation.note_exit(x, y, z)
                               return False
       return True
 
 # check for associative addition pairs
-def associative_addition_pairs(max):
-      if 1 <= max <= 20:
-            pairs = []
-            for n in range(1, max+1):
-                  for alpha in range(n):
-                        if has_associative_inverted_addition(n, alpha):
-                              pairs.append((n, alpha))
-            return pairs
-      raise ValueError("n must be between 1 and 20 inclusive")
+def associative_addition_pairs(max, engine="python", workers=None, store=None):
+      return _pairs("associative_addition", max, engine, True, workers, store)
 
 # checks for right distributivity
+@instrumentation.instrumented(instrumentation.cubic_count)
 def has_inverted_right_distributivity(n, alpha):
       for x in range(n):
             for y in range(n):
@@ -178,16 +139,232 @@ def has_inverted_right_distributivity(n, alpha):
 
                         # checks if they equal
                         if l != r:
+                              instrumentation.note_exit(x, y, z)
                               return False
       return True
 
 # check for distributive pairs
-def distributivity_pairs(max):
-      if 1 <= max <= 20:
-            pairs = []
-            for n in range(1, max+1):
-                  for alpha in range(n):
-                        if has_inverted_right_distributivity(n, alpha):
-                              pairs.append((n, alpha))
-            return pairs
-      raise ValueError("n must be between 1 and 20 inclusive")
\ No newline at end of file
+def distributivity_pairs(max, engine="python", workers=None, store=None):
+      return _pairs("right_distributivity", max, engine, True, workers, store)
+
+# checks for left distributivity
+@instrumentation.instrumented(instrumentation.cubic_count)
+def has_inverted_left_distributivity(n, alpha):
+      for x in range(n):
+            for y in range(n):
+                  for z in range(n):
+                        # calculates left part of the equation
+                        xy = (x - y) % n
+                        l = (z + xy - alpha * z * xy) % n
+
+                        # calculates right part of the equation
+                        zx = (z + x - alpha * z * x) % n
+                        zy = (z + y - alpha * z * y) % n
+                        r = (zx - zy) % n
+
+                        # checks if they equal
+                        if l != r:
+                              instrumentation.note_exit(x, y, z)
+                              return False
+      return True
+
+# check for left distributive pairs
+def left_distributivity_pairs(max, engine="python", workers=None, store=None):
+      return _pairs("left_distributivity", max, engine, True, workers, store)
+
+# property name -> (name of its checker, degree of the brute force scan in n)
+PROPERTIES = {
+      "idempotent": ("has_all_idempotents_property", 1),
+      "commutative_multiplication": ("has_commutative_inverted_multiplication", 2),
+      "commutative_addition": ("has_commutative_inverted_addition", 2),
+      "associative_multiplication": ("has_associative_inverted_multiplication", 3),
+      "associative_addition": ("has_associative_inverted_addition", 3),
+      "right_distributivity": ("has_inverted_right_distributivity", 3),
+      "left_distributivity": ("has_inverted_left_distributivity", 3),
+}
+
+# engine name -> module providing checkers with the same names as the ones above, or one
+# check_property(prop, n, alpha) for every property; properties an engine provides neither
+# way are checked by the "python" engine
+ENGINES = {
+      "python": __name__,
+      "table": "cayleyTable",
+      "search": "counterexamples",
+      "light": "lightTest",
+      "crt": "crtDecomposition",
+      "solver": "quadraticSolver",
+      "sampling": "samplingChecker",
+      "symbolic": "symbolicRules",
+      "alpha": "alphaBatch",
+      "iso": "isomorphismClasses",
+}
+
+# largest max accepted by the *_pairs sweeps, per engine and degree of the check
+SWEEP_LIMITS = {
+      "python": {1: 50, 2: 50, 3: 20},
+      "table": {1: 200, 2: 200, 3: 100},
+      "search": {1: 50, 2: 50, 3: 20},
+      "light": {1: 50, 2: 50, 3: 50},
+      "crt": {1: 200, 2: 200, 3: 100},
+      "solver": {1: 1000, 2: 50, 3: 20},
+      "sampling": {1: 500, 2: 50, 3: 46},
+      "symbolic": {1: 2000, 2: 2000, 3: 2000},
+      "alpha": {1: 1000, 2: 200, 3: 100},
+      "iso": {1: 400, 2: 400, 3: 150},
+}
+
+# returns the module of an engine name; any other engine is an object with a check_property
+# method, such as an operationKernels.Structure, or checkers of the same names as attributes,
+# and is returned as it is
+def _engine_module(engine):
+      if not isinstance(engine, str):
+            if not (hasattr(engine, "check_property")
+                    or any(hasattr(engine, checker) for checker, degree in PROPERTIES.values())):
+                  raise ValueError("Unknown engine: " + str(engine))
+            return engine
+      if engine not in ENGINES:
+            raise ValueError("Unknown engine: " + str(engine))
+      return importlib.import_module(ENGINES[engine])
+
+# returns the engine that actually checks a property when the given engine is requested
+def resolve_engine(prop, engine="python"):
+      if prop not in PROPERTIES:
+            raise ValueError("Unknown property: " + str(prop))
+      module = _engine_module(engine)
+      if hasattr(module, PROPERTIES[prop][0]) or hasattr(module, "check_property"):
+            return engine
+      return "python"
+
+# returns the checker of a property for the given engine
+def get_checker(prop, engine="python"):
+      module = _engine_module(resolve_engine(prop, engine))
+      checker = getattr(module, PROPERTIES[prop][0], None)
+      if checker is None:
+            checker = functools.partial(module.check_property, prop)
+      return checker
+
+# checks a property of (Zn, alpha) with the given engine
+def check_property(prop, n, alpha, engine="python"):
+      return get_checker(prop, engine)(n, alpha)
+
+# evaluates a property on each (n, alpha) task, over a process pool when workers is given;
+# while instrumentation is active the time of every pair and the progress are reported
+def _evaluate(prop, engine, tasks, workers=None):
+      if workers is None:
+            checker = get_checker(prop, engine)
+            if instrumentation.active() is None:
+                  return [checker(n, alpha) for n, alpha in tasks]
+            results = []
+            for n, alpha, result in _iter_checked(prop, engine, checker, tasks):
+                  results.append(result)
+                  instrumentation.progress(len(results), len(tasks), (n, alpha))
+            return results
+      degree = PROPERTIES[prop][1]
+      costs = [n ** degree for n, alpha in tasks]
+      recorder = instrumentation.active()
+      if recorder is None:
+            func = functools.partial(check_property, prop, engine=engine)
+            return sweep.parallel_map(func, tasks, costs, workers, instrumentation.progress)
+      func = functools.partial(_instrumented_check, prop, engine=engine)
+      checked = sweep.parallel_map(func, tasks, costs, workers, instrumentation.progress)
+      return [_merge_checked(recorder, prop, engine, n, alpha, item) for (n, alpha), item in zip(tasks, checked)]
+
+# checks a property in a sweep worker under a Recorder of its own, and returns the result with
+# the time of the check and the calls recorded, for the parent process to merge into its Recorder
+def _instrumented_check(prop, n, alpha, engine="python"):
+      with instrumentation.instrument() as recorder:
+            start = time.perf_counter()
+            result = check_property(prop, n, alpha, engine)
+            seconds = time.perf_counter() - start
+      return result, seconds, recorder.calls
+
+# records the measurements returned by _instrumented_check in recorder and returns the result
+def _merge_checked(recorder, prop, engine, n, alpha, checked):
+      result, seconds, calls = checked
+      recorder.record_pair(prop, str(engine), n, alpha, seconds)
+      recorder.calls.extend(calls)
+      return result
+
+# finds the pairs (n, alpha) with 1 <= n <= max whose check result equals select,
+# reusing and filling the results of a resultStore.ResultStore when one is given
+def _pairs(prop, max, engine, select, workers=None, store=None):
+      resolved = resolve_engine(prop, engine)
+      limits = SWEEP_LIMITS[resolved] if isinstance(resolved, str) else resolved.SWEEP_LIMITS
+      limit = limits[PROPERTIES[prop][1]]
+      if 1 <= max <= limit:
+            tasks = sweep.grid(max)
+            if store is None:
+                  results = _evaluate(prop, engine, tasks, workers)
+            else:
+                  # results are stored per engine; an engine object is named by its repr
+                  name = resolved if isinstance(resolved, str) else repr(resolved)
+                  results = store.sweep(prop, tasks, lambda batch: _evaluate(prop, engine, batch, workers),
+                                        engine=name)
+            return [pair for pair, result in zip(tasks, results) if result == select]
+      raise ValueError("n must be between 1 and " + str(limit) + " inclusive")
+
+# yields the (n, alpha) pairs of each modulus, skipping those rejected by where(n, alpha)
+def _iter_tasks(moduli, where):
+      for n in moduli:
+            for alpha in range(n):
+                  if where is None or where(n, alpha):
+                        yield n, alpha
+
+# streams (n, alpha, result) for a property as each pair is checked; moduli is any
+# iterable of moduli (all n >= 1 by default, without end), where(n, alpha) filters the
+# pairs before they are checked, and workers spreads them over a process pool
+def iter_property(prop, moduli=None, engine="python", where=None, workers=None):
+      checker = get_checker(prop, engine)
+      if moduli is None:
+            moduli = itertools.count(1)
+      tasks = _iter_tasks(moduli, where)
+      if workers is not None:
+            return _iter_parallel(prop, engine, tasks, workers)
+      return _iter_checked(prop, engine, checker, tasks)
+
+# checks the tasks over a process pool, merging the measurements of the workers into the
+# Recorder active when the stream starts
+def _iter_parallel(prop, engine, tasks, workers):
+      recorder = instrumentation.active()
+      if recorder is None:
+            func = functools.partial(check_property, prop, engine=engine)
+            for (n, alpha), result in sweep.iter_map(func, tasks, workers):
+                  yield n, alpha, result
+      else:
+            func = functools.partial(_instrumented_check, prop, engine=engine)
+            for (n, alpha), checked in sweep.iter_map(func, tasks, workers):
+                  yield n, alpha, _merge_checked(recorder, prop, engine, n, alpha, checked)
+
+# checks the tasks one at a time, recording each pair while instrumentation is active
+def _iter_checked(prop, engine, checker, tasks):
+      for n, alpha in tasks:
+            recorder = instrumentation.active()
+            if recorder is None:
+                  yield n, alpha, checker(n, alpha)
+            else:
+                  start = time.perf_counter()
+                  result = checker(n, alpha)
+                  recorder.record_pair(prop, str(engine), n, alpha, time.perf_counter() - start)
+                  yield n, alpha, result
+
+# streaming counterparts of the *_pairs functions, yielding (n, alpha, result) for every pair
+def iter_idempotent_pairs(moduli=None, engine="python", where=None, workers=None):
+      return iter_property("idempotent", moduli, engine, where, workers)
+
+def iter_commutative_multiplication_pairs(moduli=None, engine="python", where=None, workers=None):
+      return iter_property("commutative_multiplication", moduli, engine, where, workers)
+
+def iter_commutative_addition_pairs(moduli=None, engine="python", where=None, workers=None):
+      return iter_property("commutative_addition", moduli, engine, where, workers)
+
+def iter_associative_multiplication_pairs(moduli=None, engine="python", where=None, workers=None):
+      return iter_property("associative_multiplication", moduli, engine, where, workers)
+
+def iter_associative_addition_pairs(moduli=None, engine="python", where=None, workers=None):
+      return iter_property("associative_addition", moduli, engine, where, workers)
+
+def iter_distributivity_pairs(moduli=None, engine="python", where=None, workers=None):
+      return iter_property("right_distributivity", moduli, engine, where, workers)
+
+def iter_left_distributivity_pairs(moduli=None, engine="python", where=None, workers=None):
+      return iter_property("left_distributivity", moduli, engine, where, workers)
@@ -0,0 +1,217 @@
+"""
+Array-backed batch of elements of one (Zn, alpha).
+
+InvertedIntegerArray stores the values in a typed buffer and applies ⊗ and
+⊕ to the whole batch at once instead of allocating one InvertedInteger per
+operation. With NumPy installed and n small enough for n^2 to fit in an
+int64 the buffer is an int64 array and the operations are vectorised; alpha
+* x is reduced mod n before the second product so no intermediate
+overflows. Otherwise the buffer is an array.array (a list for n beyond 64
+bits) and the operations run over Python integers, which never overflow.
+
+    >>> a = InvertedIntegerArray([3, 4, 5], 7, 2)
+    >>> b = InvertedIntegerArray([5, 5, 5], 7, 2)
+    >>> (a * b).tolist()
+    [6, 4, 2]
+    >>> (a + InvertedInteger(1, 7, 2)).tolist()
+    [2, 3, 4]
+    >>> print(a.reduce_mul())
+    <4 mod 7 | 2 >
+"""
+import array
+
+from invertedInteger import InvertedInteger
+from ringContext import NUMPY_LIMIT, InvertedIntegerBase, add, multiply, ring_context
+from unitGroup import batch_inverse
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _buffer(values, modulus):
+    """Returns a typed buffer holding the values."""
+    if np is not None and modulus <= NUMPY_LIMIT:
+        return np.asarray(values, dtype=np.int64)
+    if modulus <= 1 << 64:
+        return array.array("Q", values)
+    return list(values)
+
+
+class InvertedIntegerArray:
+    """
+    A batch of elements of (Zn, alpha) stored as integer values.
+
+    element_type is the InvertedInteger class used when single elements are
+    taken out of the array.
+    """
+
+    def __init__(self, values, modulus, multiplier, element_type=InvertedInteger):
+        self.ring = ring_context(modulus, multiplier)
+        self.values = _buffer(values, modulus)
+        self.element_type = element_type
+        if len(self.values) and not (0 <= min(self.values) and max(self.values) < modulus):
+            raise ValueError("Values must be between 0 and modulus-1")
+
+    @classmethod
+    def _trusted(cls, values, ring, element_type):
+        """Wraps values already reduced mod n without validating them."""
+        batch = object.__new__(cls)
+        batch.ring = ring
+        batch.values = values
+        batch.element_type = element_type
+        return batch
+
+    @classmethod
+    def from_elements(cls, elements, modulus=None, multiplier=None):
+        """
+        Builds an array from a list of InvertedInteger objects of one (n, alpha).
+
+        modulus and multiplier are only needed when the list is empty.
+        """
+        elements = list(elements)
+        if elements:
+            ring = elements[0].ring
+            if any(element.ring is not ring for element in elements):
+                raise ValueError("Incompatible modulus and multiplier")
+            return cls([element._value for element in elements], ring.modulus, ring.multiplier,
+                       type(elements[0]))
+        return cls([], modulus, multiplier)
+
+    @classmethod
+    def of_ring(cls, modulus, multiplier, element_type=InvertedInteger):
+        """
+        Returns the array of every element of Zn in order.
+
+        >>> InvertedIntegerArray.of_ring(4, 1).tolist()
+        [0, 1, 2, 3]
+        """
+        if np is not None and modulus <= NUMPY_LIMIT:
+            return cls._trusted(np.arange(modulus, dtype=np.int64), ring_context(modulus, multiplier),
+                                element_type)
+        return cls(range(modulus), modulus, multiplier, element_type)
+
+    @property
+    def modulus(self):
+        return self.ring.modulus
+
+    @property
+    def multiplier(self):
+        return self.ring.multiplier
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._trusted(self.values[index], self.ring, self.element_type)
+        return self.ring.element(self.element_type, int(self.values[index]))
+
+    def __iter__(self):
+        element = self.ring.element
+        return (element(self.element_type, int(value)) for value in self.values)
+
+    def __repr__(self):
+        return f"InvertedIntegerArray({self.tolist()}, {self.modulus}, {self.multiplier})"
+
+    def tolist(self):
+        """Returns the values as a list of ints."""
+        return [int(value) for value in self.values]
+
+    def to_elements(self):
+        """Returns the elements as a list of InvertedInteger objects."""
+        return list(self)
+
+    def _operand(self, other):
+        """Returns the values of other, an array of the same length or a single element."""
+        if isinstance(other, InvertedIntegerArray):
+            if other.ring is not self.ring:
+                raise ValueError("Incompatible modulus and multiplier")
+            if len(other) != len(self) and len(other) != 1 and len(self) != 1:
+                raise ValueError("Arrays must have the same length or length 1")
+            return other.values if len(other) != 1 else other.values[0]
+        if isinstance(other, InvertedIntegerBase):
+            if other.ring is not self.ring:
+                raise ValueError("Incompatible modulus and multiplier")
+            return other._value
+        raise TypeError("Operand must be an InvertedIntegerArray or InvertedInteger")
+
+    def _apply(self, function, other, *parameters):
+        """Applies function(x, y, n, *parameters) elementwise with broadcasting."""
+        y = self._operand(other)
+        x = self.values
+        if len(x) == 1 and isinstance(other, InvertedIntegerArray):
+            x, y = x[0], other.values
+        n = self.modulus
+        if _is_vector(x) or _is_vector(y):
+            return self._trusted(function(x, y, n, *parameters), self.ring, self.element_type)
+        if not hasattr(x, "__len__"):
+            values = [function(x, value, n, *parameters) for value in y]
+        elif not hasattr(y, "__len__"):
+            values = [function(value, y, n, *parameters) for value in x]
+        else:
+            values = [function(a, b, n, *parameters) for a, b in zip(x, y)]
+        return self._trusted(_buffer(values, n), self.ring, self.element_type)
+
+    def __mul__(self, other):
+        return self._apply(multiply, other, self.multiplier)
+
+    def __add__(self, other):
+        return self._apply(add, other)
+
+    def __eq__(self, other):
+        """Returns the mask of positions where the values are equal."""
+        y = self._operand(other)
+        if _is_vector(self.values):
+            return self.values == y
+        if not hasattr(y, "__len__"):
+            return [value == y for value in self.values]
+        return [a == b for a, b in zip(self.values, y)]
+
+    __hash__ = None
+
+    def inverse(self):
+        """
+        Returns the array of the ⊗-inverses, computed together with one modular inverse
+        (unitGroup.batch_inverse). Raises ValueError if an element is not a ⊗-unit.
+
+        >>> InvertedIntegerArray([3, 5, 6], 7, 2).inverse().tolist()
+        [2, 6, 5]
+        """
+        n = self.modulus
+        alpha = self.multiplier
+        values = self.tolist()
+        try:
+            denominators = batch_inverse([(1 - alpha * x) % n for x in values], n)
+        except ValueError:
+            raise ValueError("Element has no ⊗-inverse") from None
+        return self._trusted(_buffer([-x * d % n for x, d in zip(values, denominators)], n), self.ring,
+                             self.element_type)
+
+    def reduce_mul(self):
+        """
+        Folds the array under ⊗ and returns the product as an InvertedInteger.
+
+        ⊗ is associative and commutative, so the fold is done pairwise in
+        log2(len) vectorised steps. The product of no elements is the
+        ⊗-identity 0.
+        """
+        values = self.values
+        n = self.modulus
+        alpha = self.multiplier
+        if _is_vector(values):
+            while len(values) > 1:
+                half = len(values) // 2
+                head = multiply(values[:half], values[half:2 * half], n, alpha)
+                values = np.concatenate((head, values[2 * half:]))
+        else:
+            values = list(values)
+            while len(values) > 1:
+                folded = [multiply(a, b, n, alpha) for a, b in zip(values[0::2], values[1::2])]
+                values = folded + values[len(folded) * 2:]
+        return self.ring.element(self.element_type, int(values[0]) if len(values) else 0)
+
+
+def _is_vector(values):
+    return np is not None and isinstance(values, np.ndarray)
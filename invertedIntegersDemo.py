@@ -0,0 +1,32 @@
+"""
+Runnable demo of InvertedIntegers.py.
+
+Importing InvertedIntegers.py has no side effects; this entry point prints
+the best cases of count_inverted_roots_of_unity, iterates over
+InvertedIntegers(3, 2) and runs compare_performance.
+
+    python3 invertedIntegersDemo.py
+"""
+from InvertedIntegers import InvertedIntegers, compare_performance, default_roots_summary
+
+
+def main():
+    # Running the function to find the maximum case
+    max_roots, best_cases = default_roots_summary()
+
+    # Displaying the best cases
+    print("Max Number of Inverted Roots of Unity:", max_roots)
+    for n, alpha, roots in best_cases:
+        print(f"n = {n}, alpha = {alpha}, Roots:", [str(r) for r in roots])
+
+    # Testing the iterator with an example
+    print("Iterating over InvertedIntegers(3, 2):")
+    for x in InvertedIntegers(3, 2):
+        print(x)
+
+    # Running performance comparison
+    compare_performance()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Isomorphism classes of the structures (Zn, ⊕, ⊗) and their fingerprints.
+
+A bijection φ of Zn preserving x ⊕ y = x - y is an automorphism of the
+additive group, so φ(x) = u x for a unit u. It maps x ⊗ y with multiplier
+alpha to the ⊗ with multiplier alpha / u, because
+u (x + y - alpha x y) = u x + u y - (alpha / u)(u x)(u y). So (n, alpha)
+and (n, beta) are isomorphic exactly when beta = alpha v for a unit v,
+i.e. when gcd(alpha, n) = gcd(beta, n), and the canonical form of the
+⊗ table of (n, alpha) is the table of canonical_alpha(n, alpha) =
+gcd(alpha, n) mod n. Zn then has one class per divisor of n instead of n
+multipliers.
+
+fingerprint(n, alpha) computes cheap invariants (idempotent count, count
+of square roots x ⊗ x = 0 of the identity, histogram of element orders)
+that are equal on a class and can be compared across moduli or for ⊗
+alone. The roots x ⊗ x = 1 of InvertedIntegers.py are not an invariant:
+an isomorphism maps 1 to u.
+
+Every property in invertedInteger.py is an identity in ⊕ and ⊗, so it is
+preserved by isomorphisms. check_property checks it once per class, on
+the canonical multiplier, and reuses the result for the other members.
+
+    >>> canonical_alpha(12, 10), canonical_alpha(12, 7), canonical_alpha(12, 0)
+    (2, 1, 0)
+    >>> isomorphism(12, 10, 2)
+    5
+    >>> [members for canonical, members in isomorphism_classes(6)[6].items()]
+    [[0], [1, 5], [2, 4], [3]]
+"""
+import collections
+import functools
+import math
+
+import invertedInteger
+import powerOrbit
+import quadraticSolver
+from cayleyTable import multiplication_table
+
+# Engine used to check the canonical representative of each class
+BASE_ENGINE = "table"
+
+# Number of class results memoised; the least recently used are dropped, so a sweep keeps the
+# classes of the last few moduli, which are the only ones its other multipliers reuse
+CACHE_SIZE = 1024
+
+
+def canonical_alpha(n, alpha):
+    """Returns the canonical multiplier gcd(alpha, n) mod n of the class of (n, alpha)."""
+    return math.gcd(alpha, n) % n
+
+
+def canonical_table(n, alpha):
+    """Returns the canonical form of the ⊗ table of (n, alpha), the table of its canonical multiplier."""
+    return multiplication_table(n, canonical_alpha(n, alpha))
+
+
+def isomorphism(n, alpha, beta):
+    """
+    Returns a unit u such that x -> u x maps (Zn, ⊕, ⊗ with alpha) onto (Zn, ⊕, ⊗ with beta),
+    or None if they are not isomorphic.
+    """
+    d = math.gcd(alpha, n)
+    if math.gcd(beta, n) != d:
+        return None
+    m = n // d
+    # beta = alpha v with v a unit mod m, lifted to a unit mod n by the CRT
+    v = (beta // d) * pow(alpha // d, -1, m) % m if m > 1 else 1
+    while math.gcd(v, n) != 1:
+        v += m
+    return pow(v, -1, n) if n > 1 else 0
+
+
+def fingerprint(n, alpha):
+    """
+    Returns invariants of (Zn, ⊗) equal on isomorphic structures:
+    (n, idempotent count, count of x ⊗ x = 0, ((order, count), ...)) with order 0 for
+    the elements whose powers never reach the identity.
+
+    >>> fingerprint(7, 2)
+    (7, 2, 2, ((0, 1), (1, 1), (2, 1), (3, 2), (6, 2)))
+    """
+    orders = collections.Counter(order or 0 for order in powerOrbit.element_orders(n, alpha))
+    # x ⊗ x = 0 is alpha x^2 - 2x ≡ 0
+    return (n, quadraticSolver.count_idempotents(n, alpha), quadraticSolver.count_quadratic_solutions(alpha, -2, 0, n),
+            tuple(sorted(orders.items())))
+
+
+def isomorphism_classes(max):
+    """Returns {n: {canonical multiplier: [alpha, ...]}} for 1 <= n <= max."""
+    classes = {}
+    for n in range(1, max + 1):
+        members = {}
+        for alpha in range(n):
+            members.setdefault(canonical_alpha(n, alpha), []).append(alpha)
+        classes[n] = dict(sorted(members.items()))
+    return classes
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def check_class(prop, n, canonical, engine=BASE_ENGINE):
+    """Checks a property on the canonical representative (n, canonical) of a class, memoised."""
+    return invertedInteger.check_property(prop, n, canonical, engine)
+
+
+def check_property(prop, n, alpha, engine=BASE_ENGINE):
+    """Checks a property of (Zn, alpha) on the canonical representative of its class."""
+    return check_class(prop, n, canonical_alpha(n, alpha), engine)
@@ -0,0 +1,75 @@
+"""
+Light's associativity test for (Zn, ⊗).
+
+If G generates (Zn, ⊗), then ⊗ is associative exactly when
+(x ⊗ g) ⊗ z == x ⊗ (g ⊗ z) for every x, z in Zn and every generator g.
+Checking only triples whose middle element is a generator costs
+O(n^2 * |G|) instead of O(n^3). When no small generating set exists the
+full check from invertedInteger.py is used instead.
+"""
+import cayleyTable
+import invertedInteger
+from spanClosure import SpanClosure
+
+
+def default_max_generators(n):
+    """Largest generating set for which Light's test is still worth running."""
+    return max(1, n // 4)
+
+
+def generating_set(n, alpha, max_generators=None):
+    """
+    Greedily builds a generating set of (Zn, ⊗), or returns None if it needs
+    more than max_generators elements. The span is extended incrementally
+    with spanClosure.SpanClosure as generators are added.
+
+    >>> generating_set(7, 0)
+    [1]
+    >>> generating_set(12, 1, max_generators=2) is None
+    True
+    """
+    if max_generators is None:
+        max_generators = default_max_generators(n)
+    closure = SpanClosure(n, alpha)
+    # the ⊗-identity 0 is usually a product of other elements, so it is tried last
+    for x in list(range(1, n)) + [0]:
+        if x in closure:
+            continue
+        if len(closure.generators) == max_generators:
+            return None
+        closure.add_generator(x)
+    return closure.generators
+
+
+def is_associative_on(table, generators):
+    """Checks (x ⊗ g) ⊗ z == x ⊗ (g ⊗ z) for every x, z and every g in generators."""
+    n = len(table)
+    if cayleyTable.np is None:
+        for g in generators:
+            column = [row[g] for row in table]
+            row_g = table[g]
+            for x in range(n):
+                left = table[column[x]]
+                row_x = table[x]
+                for z in range(n):
+                    if left[z] != row_x[row_g[z]]:
+                        return False
+        return True
+    for g in generators:
+        # left[x, z] = T[T[x, g], z] and right[x, z] = T[x, T[g, z]]
+        if not cayleyTable.np.array_equal(table[table[:, g]], table[:, table[g]]):
+            return False
+    return True
+
+
+def has_associative_inverted_multiplication(n, alpha, max_generators=None):
+    """
+    Checks associativity of ⊗ with Light's test, falling back to the full check.
+
+    >>> has_associative_inverted_multiplication(5, 2)
+    True
+    """
+    generators = generating_set(n, alpha, max_generators)
+    if generators is None:
+        return invertedInteger.has_associative_inverted_multiplication(n, alpha)
+    return is_associative_on(cayleyTable.cached_multiplication_table(n, alpha), generators)
@@ -1,31 +1,47 @@
+import time
+
+import instrumentation
+import tableCache
 from InvertedInteger import InvertedInteger
-def multiplicative_span(S):
+from spanClosure import SpanClosure
+
+
+def multiplicative_span(S, table=None):
     """
     Returns the multiplicative span of the set S of InvertedInteger objects.
+
+    The closure is computed by spanClosure.SpanClosure over the values of Zn;
+    table is an optional precomputed ⊗ table for the ring of S. Without one,
+    the ⊗ table of the active table cache is used if it is already cached.
     """
-    span = set()
-    
-    # Step 1: Add each element of S individually to the span.
+    S = list(S)
+    if not S:
+        return set()
+    ring = S[0].ring
     for g in S:
-        span.add(g)
-    
-    # Step 2: Use a list to store combinations of products, starting with individual generators.
-    products = list(S)
-    
-    # Step 3: Start multiplying combinations.
-    i = 0
-    while i < len(products):
-        current = products[i]
-        # Try multiplying the current product with each generator in S.
-        for g in S:
-            new_product = current * g
-            if new_product not in span:
-                span.add(new_product)
-                products.append(new_product)
-        i += 1
-    
+        if g.ring is not ring:
+            raise ValueError("Incompatible modulus and multiplier")
+
+    recorder = instrumentation.active()
+    if recorder is not None:
+        start = time.perf_counter()
+        pool_size = len(ring.pools.get(type(S[0]), ()))
+
+    cache = tableCache.active()
+    if table is None and cache is not None:
+        table = cache.peek("mul", ring.modulus, ring.multiplier)
+
+    closure = SpanClosure(ring.modulus, ring.multiplier, [g._value for g in S], table)
+    span = {ring.element(type(S[0]), x) for x in closure.values()}
+
+    if recorder is not None:
+        # every element of the span is multiplied once by every generator
+        recorder.record_call("multiplicative_span", ring.modulus, ring.multiplier, time.perf_counter() - start,
+                             len(span) * len(closure.generators),
+                             allocated=len(ring.pools[type(S[0])]) - pool_size)
     return span
 
+
 if __name__ == "__main__":
     # Example usage:
     g1 = InvertedInteger(3, 7, 2)
@@ -0,0 +1,232 @@
+"""
+Generated kernels for user-defined ⊗ and ⊕ operations.
+
+An operation is declared as a polynomial in x and y with integer
+coefficients and named parameters, e.g. "x + y + alpha*x*y" or
+"beta*x - y". compile_operation parses it once (only +, -, * and
+constant non-negative powers up to a total degree of MAX_DEGREE are
+accepted), generates Python source for three specialised kernels and
+caches the compiled result of the most recent formulas:
+
+    scalar(x, y, n, *parameters)        one product, reduced mod n
+    lists(n, *parameters)               the n x n table as nested lists
+    arrays(x, y, n, *parameters)        the table from NumPy int64 arrays
+
+In the array kernel every product is taken of operands already reduced
+mod n and is reduced right away, so no intermediate leaves the int64 range
+for n up to NUMPY_LIMIT, whatever the formula.
+
+Structure bundles a ⊗ and a ⊕ formula, one parameter swept like alpha and
+fixed values for the others. Its check_property reads the properties of
+invertedInteger.py off the generated tables with the checks of
+cayleyTable.py, so it can be passed as the engine of check_property and
+the *_pairs and iter_*_pairs sweeps. multiplicative_span runs
+spanClosure.SpanClosure on its ⊗ table. The default Structure() is the
+inverted integers themselves.
+
+    >>> compile_operation("x + y + alpha*x*y", ("alpha",)).scalar(3, 5, 7, 2)
+    3
+    >>> variant = Structure("x + y + alpha*x*y")
+    >>> variant.check_property("associative_multiplication", 6, 4), variant.check_property("idempotent", 6, 4)
+    (True, False)
+    >>> variant = Structure(addition="beta*x - y", beta=2)
+    >>> variant.check_property("right_distributivity", 8, 3), variant.check_property("associative_addition", 8, 3)
+    (True, False)
+"""
+import ast
+import collections
+import copy
+import functools
+import keyword
+
+import cayleyTable
+from invertedInteger import PROPERTIES, SWEEP_LIMITS
+from ringContext import NUMPY_LIMIT
+from spanClosure import SpanClosure
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Largest constant exponent accepted in a formula
+MAX_EXPONENT = 16
+
+# Largest degree of a formula, counting constants as factors too: the array kernel expands
+# every power, so its source is at most the size of the formula times its degree
+MAX_DEGREE = 64
+
+# formulas of the inverted integers
+MULTIPLICATION = "x + y - alpha*x*y"
+ADDITION = "x - y"
+
+# compiled kernels of one formula and the source they were generated from
+Kernel = collections.namedtuple("Kernel", "scalar lists arrays source")
+
+
+def _validate(node, names):
+    """
+    Raises ValueError unless node is a polynomial in the given names with integer coefficients.
+
+    Returns the degree of node, with every name and constant counted as a factor of degree 1.
+    """
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub)):
+        return max(_validate(node.left, names), _validate(node.right, names))
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
+        return _validate(node.left, names) + _validate(node.right, names)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+        degree = _validate(node.left, names)
+        exponent = node.right
+        if not (isinstance(exponent, ast.Constant) and type(exponent.value) is int
+                and 0 <= exponent.value <= MAX_EXPONENT):
+            raise ValueError(f"Exponents must be integer constants between 0 and {MAX_EXPONENT}")
+        return max(degree * exponent.value, 1)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        return _validate(node.operand, names)
+    if isinstance(node, ast.Name):
+        if node.id not in names:
+            raise ValueError("Unknown name in formula: " + node.id)
+        return 1
+    if not (isinstance(node, ast.Constant) and type(node.value) is int):
+        raise ValueError("Formulas may only use +, -, *, constant powers, integers, x, y and the parameters")
+    return 1
+
+
+class _Reduce(ast.NodeTransformer):
+    """Rewrites a formula so that every product is taken of operands in [0, n) and reduced mod n."""
+
+    def visit_BinOp(self, node):
+        if isinstance(node.op, ast.Pow):
+            # b ** k becomes b * b * ... * b, with b ** 0 = 1
+            exponent = node.right.value
+            if exponent == 0:
+                return self.visit(ast.Constant(1))
+            product = node.left
+            for _ in range(exponent - 1):
+                product = ast.BinOp(product, ast.Mult(), copy.deepcopy(node.left))
+            return self.visit(product)
+        node = self.generic_visit(node)
+        if isinstance(node.op, ast.Mult):
+            return _mod(ast.BinOp(_operand(node.left), ast.Mult(), _operand(node.right)))
+        return node
+
+    def visit_Constant(self, node):
+        return _mod(node)
+
+
+def _mod(node):
+    return ast.BinOp(node, ast.Mod(), ast.Name("n", ast.Load()))
+
+
+def _operand(node):
+    """Returns node reduced mod n unless it already is: a variable, a parameter or a reduced product."""
+    if isinstance(node, ast.Name) or (isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mod)):
+        return node
+    return _mod(node)
+
+
+@functools.lru_cache(maxsize=128)
+def compile_operation(formula, parameters=()):
+    """Returns the Kernel of formula, a polynomial in x, y and the named parameters, compiled once."""
+    for name in parameters:
+        if not name.isidentifier() or keyword.iskeyword(name) or name in ("x", "y", "n", "range"):
+            raise ValueError("Invalid parameter name: " + str(name))
+    if len(set(parameters)) != len(parameters):
+        raise ValueError("Parameter names must be distinct")
+    tree = ast.parse(formula, mode="eval").body
+    names = ("x", "y") + tuple(parameters)
+    if _validate(tree, set(names)) > MAX_DEGREE:
+        raise ValueError(f"Formulas may have degree at most {MAX_DEGREE} once powers are expanded")
+    plain = ast.unparse(tree)
+    reduced = ast.unparse(ast.fix_missing_locations(_Reduce().visit(ast.parse(formula, mode="eval").body)))
+    arguments = ", ".join(("n",) + tuple(parameters))
+    source = (f"def scalar(x, y, {arguments}):\n"
+              f"    return ({plain}) % n\n"
+              f"\n"
+              f"def lists({arguments}):\n"
+              f"    return [[({plain}) % n for y in range(n)] for x in range(n)]\n"
+              f"\n"
+              f"def arrays(x, y, {arguments}):\n"
+              f"    return ({reduced}) % n\n")
+    namespace = {}
+    exec(compile(source, f"<operation {formula}>", "exec"), namespace)
+    return Kernel(namespace["scalar"], namespace["lists"], namespace["arrays"], source)
+
+
+class Structure:
+    """
+    (Zn, ⊗, ⊕) with ⊗ and ⊕ given as polynomial formulas.
+
+    parameter names the parameter swept like alpha, 0 <= alpha < n, and values fixes
+    every other parameter used in the formulas.
+    """
+
+    # largest max accepted by the *_pairs sweeps with this engine, per degree of the check
+    SWEEP_LIMITS = SWEEP_LIMITS["table"]
+
+    def __init__(self, multiplication=MULTIPLICATION, addition=ADDITION, parameter="alpha", **values):
+        self.multiplication = multiplication
+        self.addition = addition
+        self.parameter = parameter
+        if parameter in values:
+            raise ValueError("The swept parameter cannot have a fixed value: " + str(parameter))
+        for name, value in values.items():
+            # floats would make the kernels compute outside Zn and the tables truncate silently
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise ValueError(f"Parameter {name} must be an integer, got {value!r}")
+        self.values = values
+        self.parameters = (parameter,) + tuple(sorted(values))
+        # compiled here so that a bad formula is reported at once
+        compile_operation(multiplication, self.parameters)
+        compile_operation(addition, self.parameters)
+
+    def __repr__(self):
+        fixed = "".join(f", {name}={value}" for name, value in sorted(self.values.items()))
+        return f"Structure({self.multiplication!r}, {self.addition!r}, parameter={self.parameter!r}{fixed})"
+
+    def __eq__(self, other):
+        return isinstance(other, Structure) and repr(self) == repr(other)
+
+    def __hash__(self):
+        return hash(repr(self))
+
+    def _arguments(self, n, alpha):
+        if n <= 0:
+            raise ValueError("Modulus must be positive.")
+        if not (0 <= alpha < n):
+            raise ValueError("Multiplier must be between 0 and modulus-1")
+        return (n, alpha) + tuple(self.values[name] % n for name in self.parameters[1:])
+
+    def _table(self, formula, n, alpha):
+        kernel = compile_operation(formula, self.parameters)
+        arguments = self._arguments(n, alpha)
+        if np is None or n > NUMPY_LIMIT:
+            return kernel.lists(*arguments)
+        x = np.arange(n, dtype=np.int64)
+        table = kernel.arrays(x[:, None], x[None, :], *arguments)
+        return np.broadcast_to(table, (n, n)).astype(cayleyTable.table_dtype(n))
+
+    def multiply(self, x, y, n, alpha):
+        """Returns x ⊗ y in Zn."""
+        return compile_operation(self.multiplication, self.parameters).scalar(x, y, *self._arguments(n, alpha))
+
+    def add(self, x, y, n, alpha):
+        """Returns x ⊕ y in Zn."""
+        return compile_operation(self.addition, self.parameters).scalar(x, y, *self._arguments(n, alpha))
+
+    def multiplication_table(self, n, alpha):
+        return self._table(self.multiplication, n, alpha)
+
+    def addition_table(self, n, alpha):
+        return self._table(self.addition, n, alpha)
+
+    def check_property(self, prop, n, alpha):
+        """Checks a property of (Zn, alpha) on the generated tables, with the checks of cayleyTable.py."""
+        if prop not in PROPERTIES:
+            raise ValueError("Unknown property: " + str(prop))
+        formulas = {"mul": self.multiplication, "add": self.addition}
+        return cayleyTable.check_tables(prop, lambda operation: self._table(formulas[operation], n, alpha))
+
+    def multiplicative_span(self, generators, n, alpha):
+        """Returns the sorted ⊗-span of the generators in Zn."""
+        return SpanClosure(n, alpha, generators, self.multiplication_table(n, alpha)).values()
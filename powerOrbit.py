@@ -0,0 +1,120 @@
+"""
+Orbits of the powers x, x ⊗ x, x ⊗ x ⊗ x, ... of an element of (Zn, ⊗).
+
+Zn is finite, so the powers of x are eventually periodic: there is a
+smallest index m >= 1 and period p >= 1 with x^(m + p) = x^m, and then
+x^(k + p) = x^k for every k >= m. power_orbit finds them with Brent's
+cycle detection, stepping y -> y ⊗ x with O(1) memory.
+
+For every x at once, power_orbits uses 1 - α x^k = (1 - α x)^k: reducing
+mod α n, the powers of x under ⊗ correspond one to one with the powers of
+t = 1 - α x under ordinary multiplication mod α n, so their index and
+period are the same. When α is a unit mod n the same holds mod n, which
+is then factorised instead of α n. Per prime power p^e of the modulus, t
+is either divisible by p, giving an index of ceil(e / v_p(t)), or a unit,
+giving a period equal to its multiplicative order mod p^e. With α = 0,
+x^k = k x is purely periodic with period n / gcd(n, x).
+
+element_orders gives the order of each x, the least k >= 1 with x^k = 0
+(the identity of ⊗), or None when x never returns to 0.
+
+    >>> power_orbit(3, 7, 2)
+    (1, 3)
+    >>> power_orbit(4, 9, 1)
+    (2, 1)
+    >>> element_orders(7, 2)
+    [1, 2, 3, 3, None, 6, 6]
+"""
+import math
+
+from crtDecomposition import factorize
+from ringContext import multiply, power
+
+
+def _step(x, n, alpha):
+    return lambda y: multiply(x, y, n, alpha)
+
+
+def power_orbit(x, n, alpha):
+    """Returns (index, period) of the powers of x with Brent's algorithm."""
+    step = _step(x, n, alpha)
+    # find the period: the tortoise waits at powers of two while the hare walks from x^1
+    power = period = 1
+    tortoise, hare = x, step(x)
+    while tortoise != hare:
+        if power == period:
+            tortoise = hare
+            power *= 2
+            period = 0
+        hare = step(hare)
+        period += 1
+    # find the index: walk two pointers period apart until they meet
+    tortoise = hare = x
+    for _ in range(period):
+        hare = step(hare)
+    index = 1
+    while tortoise != hare:
+        tortoise = step(tortoise)
+        hare = step(hare)
+        index += 1
+    return index, period
+
+
+def _valuation(t, p, e):
+    """Returns the exponent of p in t, capped at e."""
+    v = 0
+    while v < e and t % p == 0:
+        t //= p
+        v += 1
+    return v
+
+
+def _unit_order(t, p, e, group_primes):
+    """Returns the multiplicative order of the unit t mod p^e, given the primes dividing φ(p^e)."""
+    q = p ** e
+    order = (p - 1) * p ** (e - 1)
+    for r in group_primes:
+        while order % r == 0 and pow(t, order // r, q) == 1:
+            order //= r
+    return order
+
+
+def power_orbits(n, alpha):
+    """
+    Returns the list of (index, period) of every x in Zn.
+
+    >>> power_orbits(9, 1)
+    [(1, 1), (1, 1), (1, 2), (1, 3), (2, 1), (1, 6), (1, 3), (2, 1), (1, 6)]
+    """
+    if alpha == 0:
+        return [(1, n // math.gcd(n, x)) for x in range(n)]
+    # when α is a unit mod n, x -> 1 - α x is a bijection of Zn and the orbits can be read mod n
+    modulus = n if math.gcd(alpha, n) == 1 else alpha * n
+    # per prime power of α n: (p, e, p^e, primes dividing φ(p^e))
+    components = []
+    for p, e in factorize(modulus):
+        group_primes = {r for r, _ in factorize(p - 1)}
+        if e > 1:
+            group_primes.add(p)
+        components.append((p, e, p ** e, sorted(group_primes)))
+    orbits = []
+    for x in range(n):
+        t = (1 - alpha * x) % modulus
+        index = period = 1
+        for p, e, q, group_primes in components:
+            v = _valuation(t, p, e)
+            if v:
+                index = max(index, -(-e // v))
+            else:
+                order = _unit_order(t % q, p, e, group_primes)
+                period = period * order // math.gcd(period, order)
+        orbits.append((index, period))
+    return orbits
+
+
+def element_orders(n, alpha):
+    """Returns the order of every x in Zn under ⊗, or None for the x whose powers never reach 0."""
+    # once x^k = 0 the powers start over from x, so the order is the period when x^period = 0
+    inverse_multiplier = pow(alpha, -1, n) if alpha and math.gcd(alpha, n) == 1 else None
+    return [period if power(x, period, n, alpha, inverse_multiplier) == 0 else None
+            for x, (index, period) in enumerate(power_orbits(n, alpha))]
@@ -0,0 +1,192 @@
+"""
+Number-theoretic solvers for the idempotents and roots of unity of ⊗.
+
+x ⊗ x = x is the quadratic congruence x - alpha * x^2 ≡ 0 (mod n) and
+x ⊗ x = 1 is alpha * x^2 - 2x + 1 ≡ 0 (mod n). Instead of trying every x,
+n is factored and the congruence is solved modulo each prime power p^k:
+roots modulo p come from the quadratic formula with a Tonelli-Shanks square
+root, they are lifted to p^k with Hensel's lemma, and the solutions for the
+prime powers are combined with the Chinese Remainder Theorem. Counting the
+solutions only needs the per prime power counts, so it never enumerates
+more than the solutions of the largest prime power.
+
+The brute force functions in invertedInteger.py and InvertedIntegers.py
+remain the reference these are tested against.
+
+    >>> idempotents(12, 5)
+    [0, 5, 8, 9]
+    >>> inverted_roots_of_unity(15, 7)
+    [4, 7]
+"""
+from crtDecomposition import factorize
+
+
+def sqrt_mod_prime(a, p):
+    """
+    Returns a square root of a modulo the prime p, or None if a is not a square.
+
+    >>> sqrt_mod_prime(2, 7) in (3, 4)
+    True
+    >>> sqrt_mod_prime(3, 7) is None
+    True
+    """
+    a %= p
+    if a == 0 or p == 2:
+        return a
+    if pow(a, (p - 1) // 2, p) != 1:
+        return None
+    if p % 4 == 3:
+        return pow(a, (p + 1) // 4, p)
+    # Tonelli-Shanks with p - 1 = q * 2^s, q odd
+    q, s = p - 1, 0
+    while q % 2 == 0:
+        q //= 2
+        s += 1
+    z = 2
+    while pow(z, (p - 1) // 2, p) != p - 1:
+        z += 1
+    m, c, t, r = s, pow(z, q, p), pow(a, q, p), pow(a, (q + 1) // 2, p)
+    while t != 1:
+        i, t2 = 0, t
+        while t2 != 1:
+            t2 = t2 * t2 % p
+            i += 1
+        b = pow(c, 1 << (m - i - 1), p)
+        m, c, t, r = i, b * b % p, t * b * b % p, r * b % p
+    return r
+
+
+def _roots_mod_prime(a, b, c, p):
+    """Returns the roots of a x^2 + b x + c modulo p, which is not the zero polynomial mod p."""
+    a, b, c = a % p, b % p, c % p
+    if p == 2:
+        return [x for x in range(2) if (a * x * x + b * x + c) % 2 == 0]
+    if a == 0:
+        return [] if b == 0 else [(-c * pow(b, -1, p)) % p]
+    root = sqrt_mod_prime(b * b - 4 * a * c, p)
+    if root is None:
+        return []
+    inverse = pow(2 * a, -1, p)
+    return sorted({(-b + root) * inverse % p, (-b - root) * inverse % p})
+
+
+def _content_exponent(a, b, c, p, k):
+    """Returns the exponent e <= k of the largest power of p dividing a, b and c."""
+    e = 0
+    while e < k and a % p == 0 and b % p == 0 and c % p == 0:
+        a, b, c = a // p, b // p, c // p
+        e += 1
+    return e
+
+
+def _solve_primitive(a, b, c, p, k):
+    """Returns the roots modulo p^k of a x^2 + b x + c, which is not the zero polynomial mod p."""
+    solutions = _roots_mod_prime(a, b, c, p)
+    pj = p
+    for _ in range(1, k):
+        lifted = []
+        for r in solutions:
+            value = (a * r * r + b * r + c) % (pj * p)
+            slope = (2 * a * r + b) % p
+            if slope:
+                # Hensel: f(r + t p^j) ≡ f(r) + t p^j f'(r) (mod p^(j+1))
+                t = -(value // pj) * pow(slope, -1, p) % p
+                lifted.append(r + t * pj)
+            elif value == 0:
+                lifted.extend(r + t * pj for t in range(p))
+        solutions = lifted
+        pj *= p
+    return solutions
+
+
+def solve_prime_power(a, b, c, p, k):
+    """
+    Returns the sorted roots of a x^2 + b x + c modulo p^k.
+
+    >>> solve_prime_power(1, 0, -1, 2, 3)
+    [1, 3, 5, 7]
+    """
+    q = p ** k
+    e = _content_exponent(a, b, c, p, k)
+    if e == k:
+        return list(range(q))
+    step = p ** (k - e)
+    roots = _solve_primitive(a // p ** e, b // p ** e, c // p ** e, p, k - e)
+    return sorted(r + t * step for r in roots for t in range(p ** e))
+
+
+def count_prime_power(a, b, c, p, k):
+    """Returns the number of roots of a x^2 + b x + c modulo p^k."""
+    e = _content_exponent(a, b, c, p, k)
+    if e == k:
+        return p ** k
+    return len(_solve_primitive(a // p ** e, b // p ** e, c // p ** e, p, k - e)) * p ** e
+
+
+def crt_combine(residues, moduli):
+    """
+    Returns the sorted x modulo prod(moduli) with x mod m_i in residues[i] for every i.
+
+    >>> crt_combine([[1, 2], [0]], [3, 5])
+    [10, 5]
+    """
+    solutions, modulus = [0], 1
+    for roots, q in zip(residues, moduli):
+        # x ≡ s (mod modulus) and x ≡ r (mod q) with gcd(modulus, q) = 1
+        inverse = pow(modulus, -1, q)
+        solutions = [s + modulus * ((r - s) * inverse % q) for s in solutions for r in roots]
+        modulus *= q
+    return solutions
+
+
+def solve_quadratic(a, b, c, n):
+    """
+    Returns the sorted x in Zn with a x^2 + b x + c ≡ 0 (mod n).
+
+    >>> solve_quadratic(1, 0, -1, 24)
+    [1, 5, 7, 11, 13, 17, 19, 23]
+    """
+    factors = factorize(n)
+    residues = [solve_prime_power(a, b, c, p, k) for p, k in factors]
+    return sorted(crt_combine(residues, [p ** k for p, k in factors]))
+
+
+def count_quadratic_solutions(a, b, c, n):
+    """
+    Returns the number of x in Zn with a x^2 + b x + c ≡ 0 (mod n).
+
+    >>> count_quadratic_solutions(1, 0, -1, 24)
+    8
+    """
+    count = 1
+    for p, k in factorize(n):
+        count *= count_prime_power(a, b, c, p, k)
+    return count
+
+
+def idempotents(n, alpha):
+    """Returns the sorted x in Zn with x ⊗ x = x, i.e. x - alpha * x^2 ≡ 0."""
+    return solve_quadratic(-alpha, 1, 0, n)
+
+
+def count_idempotents(n, alpha):
+    return count_quadratic_solutions(-alpha, 1, 0, n)
+
+
+def inverted_roots_of_unity(n, alpha):
+    """
+    Returns the sorted x in Zn with x ⊗ x = 1, i.e. alpha * x^2 - 2x + 1 ≡ 0.
+
+    As in InvertedIntegers.py, Z1 = {0} has the single root 0.
+    """
+    return solve_quadratic(alpha, -2, 1, n)
+
+
+def count_inverted_roots_of_unity(n, alpha):
+    return count_quadratic_solutions(alpha, -2, 1, n)
+
+
+# checker with the same name and signature as the one in invertedInteger.py
+
+def has_all_idempotents_property(n, alpha):
+    return count_idempotents(n, alpha) == n
@@ -0,0 +1,113 @@
+"""
+Persistent on-disk store for sweep results.
+
+Results are kept in a SQLite database keyed by (property, engine, n,
+alpha, version), where engine names the engine that computed the result
+(the "sampling" engine is not exact, and the root engines return values,
+so results of different engines are never mixed) and version identifies
+the checker semantics and is bumped whenever a change could alter
+results. Sweeps look the store up first and only compute the missing
+pairs. Those are evaluated in batches of whole
+moduli and each batch is committed as soon as it finishes, so an
+interrupted sweep resumes from its last committed batch.
+
+    >>> store = ResultStore(":memory:")
+    >>> store.put("idempotent", 2, 1, True)
+    >>> store.get("idempotent", 2, 1)
+    True
+    >>> store.get("idempotent", 3, 1) is None
+    True
+"""
+import json
+import sqlite3
+
+# Version of the checker semantics the stored results belong to
+VERSION = 1
+
+# Engine recorded for results stored without one, the default engine of the sweeps
+DEFAULT_ENGINE = "python"
+
+# Columns of the results table, in order
+COLUMNS = ["property", "engine", "n", "alpha", "version", "value"]
+
+# Number of (n, alpha) pairs evaluated between two checkpoints of a sweep
+CHECKPOINT_SIZE = 1000
+
+
+class ResultStore:
+    def __init__(self, path, version=VERSION):
+        self.path = path
+        self.version = version
+        self.connection = sqlite3.connect(path)
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(results)")]
+        if columns and columns != COLUMNS:
+            self.connection.close()
+            raise ValueError(f"{path} has a results table that is not a result store")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "property TEXT, engine TEXT, n INTEGER, alpha INTEGER, version INTEGER, value TEXT, "
+            "PRIMARY KEY (property, engine, n, alpha, version))")
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def get(self, prop, n, alpha, engine=DEFAULT_ENGINE):
+        """Returns the stored result of engine for (prop, n, alpha), or None if there is none."""
+        row = self.connection.execute(
+            "SELECT value FROM results WHERE property = ? AND engine = ? AND n = ? AND alpha = ? AND version = ?",
+            (prop, engine, n, alpha, self.version)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def get_many(self, prop, pairs, engine=DEFAULT_ENGINE):
+        """Returns {(n, alpha): result} for the pairs that are stored for engine."""
+        pairs = set(pairs)
+        if not pairs:
+            return {}
+        moduli = [n for n, alpha in pairs]
+        rows = self.connection.execute(
+            "SELECT n, alpha, value FROM results "
+            "WHERE property = ? AND engine = ? AND version = ? AND n BETWEEN ? AND ?",
+            (prop, engine, self.version, min(moduli), max(moduli)))
+        return {(n, alpha): json.loads(value) for n, alpha, value in rows if (n, alpha) in pairs}
+
+    def put(self, prop, n, alpha, value, engine=DEFAULT_ENGINE):
+        self.put_many(prop, [((n, alpha), value)], engine)
+
+    def put_many(self, prop, items, engine=DEFAULT_ENGINE):
+        """Stores ((n, alpha), result) items computed by engine and commits them."""
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+            [(prop, engine, n, alpha, self.version, json.dumps(value)) for (n, alpha), value in items])
+        self.connection.commit()
+
+    def sweep(self, prop, tasks, evaluate, checkpoint_size=CHECKPOINT_SIZE, engine=DEFAULT_ENGINE):
+        """
+        Returns the results of prop computed by engine for every (n, alpha) task, in task order.
+
+        Stored results are reused. The missing tasks are passed to evaluate,
+        which returns their results as a list, in batches of whole moduli of
+        about checkpoint_size tasks, and each batch is stored before the next
+        one starts.
+        """
+        tasks = list(tasks)
+        known = self.get_many(prop, tasks, engine)
+        missing = [task for task in tasks if task not in known]
+        start = 0
+        while start < len(missing):
+            end = min(start + checkpoint_size, len(missing))
+            # extend the batch to the end of its last modulus
+            while end < len(missing) and missing[end][0] == missing[end - 1][0]:
+                end += 1
+            batch = missing[start:end]
+            items = list(zip(batch, evaluate(batch)))
+            self.put_many(prop, items, engine)
+            known.update(items)
+            start = end
+        return [known[task] for task in tasks]
@@ -0,0 +1,231 @@
+"""
+Shared ring contexts and the slotted core of the InvertedInteger classes.
+
+A RingContext holds the modulus n and multiplier alpha of Zn. Contexts are
+cached, so every element of the same (n, alpha) refers to one context
+object and the compatibility check in ⊗ and ⊕ is an identity comparison.
+Elements are interned per context and class: constructing or computing the
+same value twice while the first is alive returns the same object, and
+the results of ⊗ and ⊕ skip the range validation since they are already
+reduced mod n. Interned elements are shared, so they are immutable. Pools
+and the context cache hold weak references, so elements and contexts no
+longer used anywhere are freed.
+
+    >>> x = InvertedIntegerBase(3, 7, 2)
+    >>> y = InvertedIntegerBase(5, 7, 2)
+    >>> (x * y)._value, (x + y)._value
+    (6, 5)
+    >>> x * y is InvertedIntegerBase(6, 7, 2)
+    True
+    >>> (x ** 3)._value, (x * x * x)._value
+    (0, 0)
+    >>> (x * x.inverse())._value, (x ** -2 * x ** 2)._value
+    (0, 0)
+"""
+import functools
+import math
+import operator
+import weakref
+
+
+# Largest modulus n for which the product of two residues mod n fits in an int64, so NumPy arrays
+# of residues can be multiplied and reduced without overflow
+NUMPY_LIMIT = math.isqrt(2 ** 63 - 1)
+
+
+class RingContext:
+    __slots__ = ("modulus", "multiplier", "pools", "inverse_multiplier", "__weakref__")
+
+    def __init__(self, modulus, multiplier):
+        self.modulus = modulus
+        self.multiplier = multiplier
+        # element class -> {value: weak reference to the interned element}, so that values
+        # no longer referenced anywhere else are freed
+        self.pools = {}
+        # α^-1 mod n, which lets power() work mod n instead of mod α n, or None when α is not a unit
+        self.inverse_multiplier = pow(multiplier, -1, modulus) if math.gcd(multiplier, modulus) == 1 else None
+
+    def element(self, cls, value):
+        """Returns the interned element of class cls with this value, without validating it."""
+        pool = self.pools.get(cls)
+        if pool is None:
+            pool = self.pools[cls] = {}
+        reference = pool.get(value)
+        if reference is not None:
+            element = reference()
+            if element is not None:
+                return element
+        element = object.__new__(cls)
+        element._value = value
+        element.ring = self
+        pool[value] = weakref.ref(element, functools.partial(_discard, pool, value))
+        return element
+
+
+def _discard(pool, key, reference):
+    """Removes the entry of a collected object from its pool, unless it was replaced since."""
+    if pool.get(key) is reference:
+        del pool[key]
+
+
+# (modulus, multiplier) -> weak reference to the shared RingContext, which lives as long as one
+# of its elements (or another holder) refers to it
+_contexts = {}
+
+
+def ring_context(modulus, multiplier):
+    """Returns the shared context of (Zn, alpha), validating it on first use."""
+    # integer-like arguments such as NumPy integers share the context of the equal ints,
+    # and floats are rejected instead of being looked up by equality
+    modulus, multiplier = operator.index(modulus), operator.index(multiplier)
+    reference = _contexts.get((modulus, multiplier))
+    context = None if reference is None else reference()
+    if context is None:
+        if modulus <= 0:
+            raise ValueError("Modulus must be positive.")
+        if not (0 <= multiplier < modulus):
+            raise ValueError("Multiplier must be between 0 and modulus-1")
+        context = RingContext(modulus, multiplier)
+        key = (modulus, multiplier)
+        _contexts[key] = weakref.ref(context, functools.partial(_discard, _contexts, key))
+    return context
+
+
+def multiply(x, y, modulus, multiplier):
+    """
+    Returns x ⊗ y = (x + y - α x y) mod n, for ints or NumPy int64 arrays of residues mod n.
+
+    α x is reduced mod n before multiplying by y, so the product has 2 log n bits instead of
+    3 log n and an int64 array never overflows for n <= NUMPY_LIMIT. Arrays broadcast, and
+    the multiplier may be an array too.
+
+    >>> multiply(3, 5, 7, 2), multiply(3, 0, 7, 2)
+    (6, 3)
+    """
+    return (x + y - multiplier * x % modulus * y) % modulus
+
+
+def add(x, y, modulus):
+    """Returns x ⊕ y = (x - y) mod n, for ints or NumPy int64 arrays of residues mod n."""
+    return (x - y) % modulus
+
+
+def polynomial(x, y, multiplier):
+    """Returns x + y - α x y over the integers, the polynomial that multiply reduces mod n."""
+    return x + y - multiplier * x * y
+
+
+def inverse(value, modulus, multiplier):
+    """
+    Returns the ⊗-inverse y of value in Zn, with value ⊗ y = 0.
+
+    y (1 - α x) ≡ -x (mod n) has the unique solution y = -x / (1 - α x) when 1 - α x is a unit mod n,
+    and x has no inverse otherwise (see unitGroup.py, which inverts every element of Zn at once).
+
+    >>> inverse(3, 7, 2), inverse(2, 6, 2)
+    (2, None)
+    """
+    denominator = (1 - multiplier * value) % modulus
+    if math.gcd(denominator, modulus) != 1:
+        return None
+    return -value * pow(denominator, -1, modulus) % modulus
+
+
+def power(value, exponent, modulus, multiplier, inverse_multiplier=None):
+    """
+    Returns value ⊗ value ⊗ ... ⊗ value (exponent times) in Zn, with value^0 = 0, the identity of ⊗.
+
+    ⊗ is associative since 1 - α (x ⊗ y) = (1 - α x)(1 - α y), so 1 - α x^k = (1 - α x)^k over
+    the integers and x^k = (1 - (1 - α x)^k) / α. Reducing (1 - α x)^k mod α n keeps the division
+    exact, so the power costs one built-in pow, i.e. O(log k) squarings. When α is a unit mod n
+    the pow is taken mod n, on numbers half as wide as α n, and multiplied by α^-1 mod n; callers
+    holding a RingContext pass its inverse_multiplier so it is not recomputed. With α = 0, x^k = k x.
+    A negative exponent powers the ⊗-inverse and raises ValueError when value is not a unit.
+
+    >>> power(3, 5, 7, 2), power(3, 0, 7, 2), power(3, 10 ** 30, 7, 0), power(3, -1, 7, 2)
+    (2, 0, 3, 2)
+    """
+    if exponent < 0:
+        value = inverse(value, modulus, multiplier)
+        if value is None:
+            raise ValueError("Element has no ⊗-inverse")
+        exponent = -exponent
+    if multiplier == 0:
+        return exponent * value % modulus
+    if inverse_multiplier is None and math.gcd(multiplier, modulus) == 1:
+        inverse_multiplier = pow(multiplier, -1, modulus)
+    if inverse_multiplier is not None:
+        # α is a unit mod n, so dividing by α mod n replaces the exact division and pow works mod n
+        return (1 - pow(1 - multiplier * value, exponent, modulus)) * inverse_multiplier % modulus
+    reduced = multiplier * modulus
+    return (1 - pow(1 - multiplier * value, exponent, reduced)) % reduced // multiplier
+
+
+class InvertedIntegerBase:
+    """Slotted, interned element of Zn with x ⊕ y = (x - y) mod n and x ⊗ y = (x + y - α * x * y) mod n."""
+    __slots__ = ("_value", "ring", "__weakref__")
+
+    def __new__(cls, value, modulus, multiplier):
+        ring = ring_context(modulus, multiplier)
+        # interned by value, so it must be an int: an equal float would be returned for every later int
+        value = operator.index(value)
+        if not (0 <= value < modulus):
+            raise ValueError("Value must be between 0 and modulus-1")
+        return ring.element(cls, value)
+
+    def __reduce__(self):
+        return (self.__class__, (self._value, self.ring.modulus, self.ring.multiplier))
+
+    @property
+    def modulus(self):
+        return self.ring.modulus
+
+    @property
+    def multiplier(self):
+        return self.ring.multiplier
+
+    def _check_compatible(self, other):
+        if not isinstance(other, self.__class__):
+            raise TypeError("Operand must be of type InvertedInteger")
+        if other.ring is not self.ring:
+            raise ValueError("Incompatible modulus and multiplier")
+
+    def __add__(self, other):
+        ring = self.ring
+        if other.__class__ is not self.__class__ or other.ring is not ring:
+            self._check_compatible(other)
+        return ring.element(self.__class__, add(self._value, other._value, ring.modulus))
+
+    def __mul__(self, other):
+        ring = self.ring
+        if other.__class__ is not self.__class__ or other.ring is not ring:
+            self._check_compatible(other)
+        return ring.element(self.__class__, multiply(self._value, other._value, ring.modulus, ring.multiplier))
+
+    def __pow__(self, exponent):
+        ring = self.ring
+        return ring.element(self.__class__, power(self._value, exponent, ring.modulus, ring.multiplier,
+                                                  ring.inverse_multiplier))
+
+    def inverse(self):
+        """Returns the ⊗-inverse of this element; raises ValueError if it is not a unit."""
+        ring = self.ring
+        value = inverse(self._value, ring.modulus, ring.multiplier)
+        if value is None:
+            raise ValueError("Element has no ⊗-inverse")
+        return ring.element(self.__class__, value)
+
+    def orbit(self):
+        """Returns the (index, period) of the powers of this element, see powerOrbit.py."""
+        from powerOrbit import power_orbit
+        return power_orbit(self._value, self.ring.modulus, self.ring.multiplier)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, self.__class__):
+            return False
+        return self._value == other._value and self.ring is other.ring
+
+    def __hash__(self):
+        return hash((self._value, self.ring.modulus, self.ring.multiplier))
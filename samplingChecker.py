@@ -0,0 +1,118 @@
+"""
+Random-sampling property checker with a confidence bound, for huge moduli.
+
+Instead of scanning every tuple of Zn, sample_property draws a seeded
+random sample of (x,), (x, y) or (x, y, z) tuples in batches and stops at
+the first violation. If none is found among k samples, every tuple
+violating the property was missed k times in a row, which for a
+violation density of eps happens with probability (1 - eps)^k. So with
+the requested confidence the density of violations is below
+1 - (1 - confidence)^(1/k), roughly 3 / k at 95%.
+
+Batches are evaluated with NumPy when it is installed and n^2 fits in an
+int64, using the vectorisable predicates of counterexamples.py. When the
+whole space has no more tuples than the sample budget it is scanned
+exhaustively instead, and the answer is exact.
+
+    >>> sample_property("commutative_addition", 10 ** 12 + 39, 5).witness is not None
+    True
+    >>> result = sample_property("associative_multiplication", 10 ** 12 + 39, 5, samples=10 ** 4)
+    >>> result.witness, result.samples, round(result.density_bound, 6)
+    (None, 10000, 0.0003)
+"""
+import collections
+import random
+
+from counterexamples import VIOLATIONS
+from ringContext import NUMPY_LIMIT
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Default number of sampled tuples per check
+SAMPLES = 100000
+
+# Number of tuples drawn and checked at once
+BATCH_SIZE = 1 << 16
+
+# Default confidence level of the density bound
+CONFIDENCE = 0.95
+
+# witness: violating tuple or None; samples: number of tuples checked;
+# exhaustive: whether every tuple was checked; density_bound: upper bound on the
+# fraction of violating tuples at the given confidence (0 if exhaustive, None if a
+# witness was found)
+SampleResult = collections.namedtuple("SampleResult", "witness samples exhaustive density_bound confidence")
+
+
+def density_bound(samples, confidence=CONFIDENCE):
+    """
+    Returns the largest violation density that k clean samples fail to rule out.
+
+    >>> round(density_bound(1000), 5)
+    0.00299
+    """
+    if samples == 0:
+        return 1.0
+    return 1 - (1 - confidence) ** (1 / samples)
+
+
+def _batches(n, arity, samples, batch_size, exhaustive, seed):
+    """Yields the tuples to check as lists of per-variable columns."""
+    vectorised = np is not None and n <= NUMPY_LIMIT
+    if exhaustive:
+        for start in range(0, samples, batch_size):
+            # the tuples are the digits of their index in base n, most significant first
+            places = [n ** (arity - 1 - k) for k in range(arity)]
+            if vectorised:
+                index = np.arange(start, min(start + batch_size, samples), dtype=np.int64)
+                yield [index // place % n for place in places]
+            else:
+                index = range(start, min(start + batch_size, samples))
+                yield [[i // place % n for i in index] for place in places]
+        return
+    if vectorised:
+        rng = np.random.default_rng(seed)
+    else:
+        rng = random.Random(seed)
+    for start in range(0, samples, batch_size):
+        size = min(batch_size, samples - start)
+        if vectorised:
+            yield list(rng.integers(0, n, size=(arity, size), dtype=np.int64))
+        else:
+            yield [[rng.randrange(n) for _ in range(size)] for _ in range(arity)]
+
+
+def sample_property(prop, n, alpha, samples=SAMPLES, seed=0, confidence=CONFIDENCE, batch_size=BATCH_SIZE):
+    """Checks a property on a seeded random sample of tuples and returns a SampleResult."""
+    if prop not in VIOLATIONS:
+        raise ValueError("Unknown property: " + str(prop))
+    arity, violates = VIOLATIONS[prop]
+    exhaustive = n ** arity <= samples
+    if exhaustive:
+        samples = n ** arity
+    checked = 0
+    for columns in _batches(n, arity, samples, batch_size, exhaustive, seed):
+        if isinstance(columns[0], list):
+            for position, witness in enumerate(zip(*columns)):
+                if violates(n, alpha, *witness):
+                    return SampleResult(witness, checked + position + 1, exhaustive, None, confidence)
+        else:
+            mask = violates(n, alpha, *columns)
+            if mask.any():
+                position = int(np.argmax(mask))
+                witness = tuple(int(column[position]) for column in columns)
+                return SampleResult(witness, checked + position + 1, exhaustive, None, confidence)
+        checked += len(columns[0])
+    bound = 0.0 if exhaustive else density_bound(checked, confidence)
+    return SampleResult(None, checked, exhaustive, bound, confidence)
+
+
+def check_property(prop, n, alpha):
+    """
+    Checks a property of (Zn, alpha) on a sample; True means no violation was found in SAMPLES
+    tuples, which is exact when n^arity <= SAMPLES.
+    """
+    return sample_property(prop, n, alpha).witness is None
@@ -0,0 +1,203 @@
+"""
+Structure of the semigroup (Zn, ⊗): identity, zero, ideals and Green's relations.
+
+Everything is read off the ⊗ table, built once (or taken from the table
+cache) per (n, alpha). The principal right ideal x ⊗ S¹ of every x is a row
+of a bitset matrix (packed NumPy bits, or Python ints without NumPy), and
+the principal left ideal S¹ ⊗ x a row of a second one. Green's relations
+follow from comparing those rows instead of comparing sets pairwise:
+
+    x R y  iff  x ⊗ S¹ = y ⊗ S¹         x L y  iff  S¹ ⊗ x = S¹ ⊗ y
+    H = R ∩ L                           D = R ∘ L, the join of R and L
+
+R and L classes are found by hashing the rows, and D by merging them with
+a union-find. In a finite semigroup D equals J, so the D classes are also
+the classes of equal principal two-sided ideals. Ideals generated by a set
+are unions of bitset rows, and the subsemigroup generated by a set is
+spanClosure.SpanClosure, the engine of multiplicative_span, on the same
+table. analyse(n, alpha) caches the analysis per (n, alpha).
+
+⊗ is commutative, so left and right notions coincide and R = L = H = D,
+but nothing below relies on it.
+
+    >>> s = analyse(6, 2)
+    >>> s.identity, s.zero, s.idempotents
+    (0, None, [0, 2])
+    >>> s.r_classes
+    [[0, 1, 3, 4], [2, 5]]
+    >>> s.ideal([2]), s.minimal_ideal
+    ([2, 5], [2, 5])
+"""
+import functools
+
+import cayleyTable
+from spanClosure import SpanClosure
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class UnionFind:
+    """Disjoint sets over range(n) with path halving and union by size."""
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, x, y):
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return
+        if self.size[x] < self.size[y]:
+            x, y = y, x
+        self.parent[y] = x
+        self.size[x] += self.size[y]
+
+
+def _group(keys):
+    """Returns the classes of range(len(keys)) with equal keys, sorted by smallest element."""
+    classes = {}
+    for x, key in enumerate(keys):
+        classes.setdefault(key, []).append(x)
+    return list(classes.values())
+
+
+class SemigroupAnalysis:
+    def __init__(self, n, alpha):
+        self.modulus = n
+        self.multiplier = alpha
+        self.table = cayleyTable.cached_multiplication_table(n, alpha)
+        self.vectorised = np is not None
+        if self.vectorised:
+            self.table = np.asarray(self.table)
+            elements = np.arange(n)
+            right = np.zeros((n, n), dtype=bool)
+            left = np.zeros((n, n), dtype=bool)
+            # row x: x ⊗ S¹ = {x} ∪ {x ⊗ y}, and S¹ ⊗ x = {x} ∪ {y ⊗ x}
+            right[elements[:, None], self.table] = True
+            left[elements[:, None], self.table.T] = True
+            right[elements, elements] = True
+            left[elements, elements] = True
+            self._right = np.packbits(right, axis=1)
+            self._left = np.packbits(left, axis=1)
+        else:
+            self._right = [functools.reduce(int.__or__, (1 << v for v in row), 1 << x)
+                           for x, row in enumerate(self.table)]
+            self._left = [functools.reduce(int.__or__, (1 << self.table[y][x] for y in range(n)), 1 << x)
+                          for x in range(n)]
+
+    def _elements(self, bits):
+        """Returns the sorted elements of a bitset row."""
+        if self.vectorised:
+            return np.flatnonzero(np.unpackbits(bits, count=self.modulus)).tolist()
+        return [x for x in range(self.modulus) if bits >> x & 1]
+
+    def _union(self, rows, xs):
+        """Returns the union of the bitset rows of the elements xs."""
+        if self.vectorised:
+            return np.bitwise_or.reduce(rows[list(xs)], axis=0) if len(xs) else np.zeros_like(rows[0])
+        return functools.reduce(int.__or__, (rows[x] for x in xs), 0)
+
+    def _keys(self, rows):
+        return [row.tobytes() for row in rows] if self.vectorised else rows
+
+    def _first_where(self, rows_match, columns_match):
+        """Returns the first e whose row and column satisfy the given predicates, or None."""
+        n, table = self.modulus, self.table
+        if self.vectorised:
+            found = np.flatnonzero(rows_match(table) & rows_match(table.T))
+            return int(found[0]) if len(found) else None
+        for e in range(n):
+            if all(columns_match(e, x, table[e][x]) and columns_match(e, x, table[x][e]) for x in range(n)):
+                return e
+        return None
+
+    @functools.cached_property
+    def identity(self):
+        """Returns the identity element e with e ⊗ x = x ⊗ e = x, or None."""
+        return self._first_where(lambda table: (table == np.arange(self.modulus)).all(axis=1),
+                                 lambda e, x, product: product == x)
+
+    @functools.cached_property
+    def zero(self):
+        """Returns the zero element z with z ⊗ x = x ⊗ z = z, or None."""
+        return self._first_where(lambda table: (table == np.arange(self.modulus)[:, None]).all(axis=1),
+                                 lambda z, x, product: product == z)
+
+    @functools.cached_property
+    def idempotents(self):
+        return [x for x in range(self.modulus) if self.table[x][x] == x]
+
+    def principal_right_ideal(self, x):
+        """Returns x ⊗ S¹, sorted."""
+        return self._elements(self._right[x])
+
+    def principal_left_ideal(self, x):
+        """Returns S¹ ⊗ x, sorted."""
+        return self._elements(self._left[x])
+
+    def ideal(self, generators, side="two-sided"):
+        """Returns the left, right or two-sided ideal generated by the generators, sorted."""
+        generators = list(generators)
+        if side == "right":
+            return self._elements(self._union(self._right, generators))
+        left = self._union(self._left, generators)
+        if side == "left":
+            return self._elements(left)
+        if side != "two-sided":
+            raise ValueError("side must be 'left', 'right' or 'two-sided'")
+        # S¹ X S¹ is the union of the right ideals of the elements of S¹ X
+        return self._elements(self._union(self._right, self._elements(left)))
+
+    def principal_ideal(self, x):
+        """Returns S¹ ⊗ x ⊗ S¹, sorted."""
+        return self.ideal([x])
+
+    def subsemigroup(self, generators):
+        """Returns the subsemigroup generated by the generators, sorted."""
+        table = self.table if self.vectorised else None
+        return SpanClosure(self.modulus, self.multiplier, generators, table).values()
+
+    @functools.cached_property
+    def r_classes(self):
+        return _group(self._keys(self._right))
+
+    @functools.cached_property
+    def l_classes(self):
+        return _group(self._keys(self._left))
+
+    @functools.cached_property
+    def h_classes(self):
+        return _group(list(zip(self._keys(self._right), self._keys(self._left))))
+
+    @functools.cached_property
+    def d_classes(self):
+        classes = UnionFind(self.modulus)
+        for group in self.r_classes + self.l_classes:
+            for x in group[1:]:
+                classes.union(group[0], x)
+        return _group([classes.find(x) for x in range(self.modulus)])
+
+    @functools.cached_property
+    def minimal_ideal(self):
+        """Returns the kernel, the smallest two-sided ideal (the D class below every other), sorted."""
+        return min((self.principal_ideal(group[0]) for group in self.d_classes), key=len)
+
+
+@functools.lru_cache(maxsize=32)
+def analyse(n, alpha):
+    """Returns the SemigroupAnalysis of (Zn, ⊗) with multiplier alpha, cached per (n, alpha)."""
+    if n <= 0:
+        raise ValueError("Modulus must be positive.")
+    if not (0 <= alpha < n):
+        raise ValueError("Multiplier must be between 0 and modulus-1")
+    return SemigroupAnalysis(n, alpha)
@@ -0,0 +1,125 @@
+"""
+Bitset closure engine for multiplicative spans under ⊗.
+
+The span of a generating set G is every product g1 ⊗ g2 ⊗ ... ⊗ gk of
+generators. SpanClosure keeps the span as a membership bitmap over Zn
+(a NumPy bool array when NumPy is installed, a bytearray otherwise) and
+runs a breadth-first search in which each newly found element is only
+multiplied by the generators. Products are computed from the formula, or
+looked up in a precomputed ⊗ table when one is given. Adding a generator
+extends the existing span instead of recomputing it.
+
+    >>> closure = SpanClosure(7, 2, [3, 5])
+    >>> closure.values()
+    [0, 1, 2, 3, 5, 6]
+    >>> SpanClosure(12, 0, [4]).values()
+    [0, 4, 8]
+"""
+from ringContext import NUMPY_LIMIT, multiply
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Number of pending elements from which products are computed as one vectorised batch
+BATCH_SIZE = 256
+
+
+class SpanClosure:
+    def __init__(self, modulus, multiplier, generators=(), table=None):
+        if modulus <= 0:
+            raise ValueError("Modulus must be positive.")
+        self.modulus = modulus
+        self.multiplier = multiplier
+        self.generators = []
+        self.vectorised = np is not None and modulus <= NUMPY_LIMIT
+        self.table = np.asarray(table) if self.vectorised and table is not None else table
+        if self.vectorised:
+            self.members = np.zeros(modulus, dtype=bool)
+        else:
+            self.members = bytearray(modulus)
+        self.add_generators(generators)
+
+    def __len__(self):
+        return int(self.members.sum()) if self.vectorised else self.members.count(1)
+
+    def __contains__(self, x):
+        return bool(self.members[x])
+
+    def values(self):
+        """Returns the elements of the span in sorted order."""
+        if self.vectorised:
+            return np.flatnonzero(self.members).tolist()
+        return [x for x in range(self.modulus) if self.members[x]]
+
+    def add_generator(self, g):
+        """Adds a generator and extends the span with every product that uses it."""
+        self.add_generators([g])
+
+    def add_generators(self, generators):
+        """
+        Adds generators and extends the span with every product that uses them.
+
+        Products are built by multiplying on the right, so every new product
+        starts with x ⊗ g for some new generator g and x in the old span (or
+        with g itself) and continues by multiplying with the generators.
+        """
+        new = []
+        for g in generators:
+            if not (0 <= g < self.modulus):
+                raise ValueError("Generator must be between 0 and modulus-1")
+            if g not in self.generators and g not in new:
+                new.append(g)
+        if not new:
+            return
+        old = self.values()
+        self.generators.extend(new)
+        frontier = list(new)
+        if self.vectorised and old:
+            frontier += self._products(np.array(old, dtype=np.int64), np.array(new, dtype=np.int64)).tolist()
+        else:
+            frontier += [self._product(x, g) for x in old for g in new]
+        self._close(frontier)
+
+    def _product(self, x, y):
+        if self.table is not None:
+            return int(self.table[x][y])
+        return multiply(x, y, self.modulus, self.multiplier)
+
+    def _products(self, xs, ys):
+        """Returns every x ⊗ y for x in xs and y in ys as a flat int64 array."""
+        if self.table is not None:
+            return np.asarray(self.table[xs][:, ys], dtype=np.int64).ravel()
+        return multiply(xs[:, None], ys[None, :], self.modulus, self.multiplier).ravel()
+
+    def _close(self, frontier):
+        """
+        Marks the frontier and everything reachable from it by right multiplication.
+
+        Pending elements are expanded one at a time while there are few of
+        them and as one vectorised batch once there are at least BATCH_SIZE,
+        so long chains of single new elements do not pay the NumPy overhead.
+        """
+        members = self.members
+        generators = self.generators
+        pending = []
+        for x in frontier:
+            if not members[x]:
+                members[x] = 1
+                pending.append(x)
+        if self.vectorised:
+            generator_array = np.array(generators, dtype=np.int64)
+        while pending:
+            if self.vectorised and len(pending) >= BATCH_SIZE:
+                products = np.unique(self._products(np.array(pending, dtype=np.int64), generator_array))
+                products = products[~members[products]]
+                members[products] = True
+                pending = products.tolist()
+                continue
+            x = pending.pop()
+            for g in generators:
+                y = self._product(x, g)
+                if not members[y]:
+                    members[y] = 1
+                    pending.append(y)
@@ -0,0 +1,144 @@
+"""
+Process pool driver for (n, alpha) sweeps.
+
+Every (n, alpha) in a sweep is independent, so the grid is spread over a
+pool of worker processes. Tasks are packed into chunks of roughly equal
+estimated cost and the most expensive chunks are submitted first, so a
+handful of large moduli do not end up queued behind thousands of tiny
+ones. Results are always returned in the order of the tasks.
+"""
+import collections
+import itertools
+import os
+
+# Number of chunks per worker the grid is split into
+CHUNKS_PER_WORKER = 4
+
+# Number of tasks per chunk, and chunks in flight per worker, when streaming
+STREAM_CHUNK_SIZE = 32
+STREAM_CHUNKS_PER_WORKER = 2
+
+
+def grid(max):
+    """
+    Returns the (n, alpha) grid for 1 <= n <= max, 0 <= alpha < n in sweep order.
+
+    >>> grid(3)
+    [(1, 0), (2, 0), (2, 1), (3, 0), (3, 1), (3, 2)]
+    """
+    return [(n, alpha) for n in range(1, max + 1) for alpha in range(n)]
+
+
+def make_chunks(costs, count):
+    """
+    Packs task indices into chunks of roughly total / count cost each.
+
+    Tasks are taken from the most to the least expensive, so the returned
+    chunks are already ordered by decreasing cost.
+
+    >>> make_chunks([1, 8, 1, 1, 1], 2)
+    [[1], [0, 2, 3, 4]]
+    """
+    order = sorted(range(len(costs)), key=lambda i: costs[i], reverse=True)
+    target = sum(costs) / max(1, count)
+    chunks = []
+    current = []
+    current_cost = 0
+    for i in order:
+        current.append(i)
+        current_cost += costs[i]
+        if current_cost >= target:
+            chunks.append(current)
+            current = []
+            current_cost = 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _run_chunk(func, tasks):
+    """Evaluates func over the tasks of one chunk inside a worker."""
+    return [func(*task) for task in tasks]
+
+
+def parallel_map(func, tasks, costs=None, workers=None, progress=None):
+    """
+    Evaluates func(*task) for every task over a process pool.
+
+    func must be picklable (a module level function or a functools.partial
+    of one). costs gives the estimated work of each task and defaults to 1
+    each. workers defaults to the number of CPUs; with one worker the tasks
+    are evaluated in this process. progress, if given, is called as
+    progress(done, total) each time a chunk of tasks finishes.
+    """
+    tasks = list(tasks)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be a positive integer")
+    if workers == 1 or len(tasks) <= 1:
+        results = _run_chunk(func, tasks)
+        if progress is not None:
+            progress(len(tasks), len(tasks))
+        return results
+    if costs is None:
+        costs = [1] * len(tasks)
+
+    # imported here so that importing this module (and every worker) stays cheap
+    from concurrent.futures import ProcessPoolExecutor
+
+    results = [None] * len(tasks)
+    chunks = make_chunks(costs, workers * CHUNKS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(chunk, pool.submit(_run_chunk, func, [tasks[i] for i in chunk])) for chunk in chunks]
+        done = 0
+        for chunk, future in futures:
+            for i, result in zip(chunk, future.result()):
+                results[i] = result
+            done += len(chunk)
+            if progress is not None:
+                progress(done, len(tasks))
+    return results
+
+
+def iter_map(func, tasks, workers=None, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yields (task, func(*task)) for every task, in task order, as results arrive.
+
+    tasks may be an unbounded iterator: it is consumed in chunks of
+    chunk_size and at most STREAM_CHUNKS_PER_WORKER chunks per worker are in
+    flight, so memory stays constant. When the consumer stops early, chunks
+    that have not started are cancelled.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be a positive integer")
+    tasks = iter(tasks)
+    if workers == 1:
+        for task in tasks:
+            yield task, func(*task)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending = collections.deque()
+
+    def submit():
+        chunk = list(itertools.islice(tasks, chunk_size))
+        if chunk:
+            pending.append((chunk, pool.submit(_run_chunk, func, chunk)))
+        return bool(chunk)
+
+    try:
+        for _ in range(workers * STREAM_CHUNKS_PER_WORKER):
+            if not submit():
+                break
+        while pending:
+            chunk, future = pending.popleft()
+            results = future.result()
+            submit()
+            yield from zip(chunk, results)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,140 @@
+"""
+Symbolic rules deciding the properties straight from the formulas.
+
+Every property is an identity f(x, y, z) ≡ 0 (mod n) in which f = left side
+minus right side is a polynomial with integer coefficients in x, y, z and
+alpha. Because Newton's forward differences write f as an integer
+combination of binomials C(x, i) C(y, j) C(z, k), f vanishes on all of Zn
+exactly when n divides every difference Δ^(i, j, k) f(0), i.e. when n
+divides their gcd, obstruction(prop, alpha). Only the points of
+{0, ..., d}^arity are evaluated, where d bounds the degree of f in each
+variable, so the check costs O(1) big integer operations whatever n is.
+
+Working the differences out by hand gives the closed forms in RULES:
+
+    x ⊗ y - y ⊗ x = 0                               always commutative
+    (x ⊗ y) ⊗ z - x ⊗ (y ⊗ z) = 0                   always associative
+    (x ⊕ y) - (y ⊕ x) = 2x - 2y                     n | 2
+    (x ⊕ y) ⊕ z - x ⊕ (y ⊕ z) = -2z                 n | 2
+    x ⊗ x - x = x - alpha x^2, gcd = gcd(alpha - 1, 2)   n | 2 and n | alpha - 1
+    (x ⊕ y) ⊗ z - ((x ⊗ z) ⊕ (y ⊗ z)) = z          n = 1
+    z ⊗ (x ⊕ y) - ((z ⊗ x) ⊕ (z ⊗ y)) = z          n = 1
+
+decide, the check_property of the "symbolic" engine, answers from RULES.
+The brute force checkers of invertedInteger.py stay the reference:
+setting the INVERTED_INTEGER_AUDIT environment variable (or AUDIT = True)
+makes every call cross-check its answer against them, and cross_check(max)
+audits a whole grid.
+
+    >>> obstruction("idempotent", 3)
+    2
+    >>> decide("idempotent", 2, 1), decide("idempotent", 2, 0)
+    (True, False)
+    >>> decide("associative_multiplication", 10 ** 100 + 267, 12345)
+    True
+"""
+import itertools
+import math
+import os
+
+from ringContext import polynomial
+
+# When True, every decision also runs the brute force check and raises on a mismatch
+AUDIT = bool(os.environ.get("INVERTED_INTEGER_AUDIT"))
+
+
+def _mul(alpha, x, y):
+    return polynomial(x, y, alpha)
+
+
+def _add(alpha, x, y):
+    return x - y
+
+
+# property -> (arity, degree bound per variable, f(alpha, *xs) = left side - right side over Z)
+IDENTITIES = {
+    "idempotent": (1, 2, lambda alpha, x: _mul(alpha, x, x) - x),
+    "commutative_multiplication": (2, 1, lambda alpha, x, y: _mul(alpha, x, y) - _mul(alpha, y, x)),
+    "commutative_addition": (2, 1, lambda alpha, x, y: _add(alpha, x, y) - _add(alpha, y, x)),
+    "associative_multiplication": (3, 1, lambda alpha, x, y, z:
+                                   _mul(alpha, _mul(alpha, x, y), z) - _mul(alpha, x, _mul(alpha, y, z))),
+    "associative_addition": (3, 1, lambda alpha, x, y, z:
+                             _add(alpha, _add(alpha, x, y), z) - _add(alpha, x, _add(alpha, y, z))),
+    "right_distributivity": (3, 1, lambda alpha, x, y, z:
+                             _mul(alpha, _add(alpha, x, y), z) - _add(alpha, _mul(alpha, x, z), _mul(alpha, y, z))),
+    "left_distributivity": (3, 1, lambda alpha, x, y, z:
+                            _mul(alpha, z, _add(alpha, x, y)) - _add(alpha, _mul(alpha, z, x), _mul(alpha, z, y))),
+}
+
+# property -> closed form condition on (n, alpha), derived from IDENTITIES
+RULES = {
+    "idempotent": lambda n, alpha: 2 % n == 0 and (alpha - 1) % n == 0,
+    "commutative_multiplication": lambda n, alpha: True,
+    "commutative_addition": lambda n, alpha: 2 % n == 0,
+    "associative_multiplication": lambda n, alpha: True,
+    "associative_addition": lambda n, alpha: 2 % n == 0,
+    "right_distributivity": lambda n, alpha: n == 1,
+    "left_distributivity": lambda n, alpha: n == 1,
+}
+
+
+def differences(f, alpha, arity, degree):
+    """
+    Returns {(i, j, ...): Δ^(i, j, ...) f(0)} for every order up to degree in each variable.
+
+    >>> differences(lambda alpha, x: x * x, 0, 1, 2)
+    {(0,): 0, (1,): 1, (2,): 2}
+    """
+    values = {point: f(alpha, *point) for point in itertools.product(range(degree + 1), repeat=arity)}
+    for axis in range(arity):
+        values = {point: sum((-1) ** (point[axis] - j) * math.comb(point[axis], j)
+                             * values[point[:axis] + (j,) + point[axis + 1:]] for j in range(point[axis] + 1))
+                  for point in values}
+    return values
+
+
+def obstruction(prop, alpha):
+    """
+    Returns the integer g such that prop holds for (n, alpha) iff n divides g (0: always holds).
+
+    >>> obstruction("commutative_addition", 5), obstruction("associative_multiplication", 5)
+    (2, 0)
+    """
+    if prop not in IDENTITIES:
+        raise ValueError("Unknown property: " + str(prop))
+    arity, degree, f = IDENTITIES[prop]
+    return math.gcd(*differences(f, alpha, arity, degree).values())
+
+
+def decide(prop, n, alpha):
+    """Decides prop for (n, alpha) from its closed form rule, audited when AUDIT is set."""
+    if prop not in RULES:
+        raise ValueError("Unknown property: " + str(prop))
+    result = RULES[prop](n, alpha)
+    if AUDIT:
+        import invertedInteger
+        expected = invertedInteger.check_property(prop, n, alpha)
+        if result != expected:
+            raise AssertionError(f"rule for {prop} gives {result} for ({n}, {alpha}), brute force gives {expected}")
+    return result
+
+
+def cross_check(max, props=None):
+    """
+    Checks the rules, the obstructions and the brute force checkers against each other
+    for 1 <= n <= max and returns the mismatches as (prop, n, alpha, rule, obstruction, brute force).
+    """
+    import invertedInteger
+    mismatches = []
+    for prop in RULES if props is None else props:
+        for n in range(1, max + 1):
+            for alpha in range(n):
+                results = (RULES[prop](n, alpha), obstruction(prop, alpha) % n == 0,
+                           invertedInteger.check_property(prop, n, alpha))
+                if len(set(results)) > 1:
+                    mismatches.append((prop, n, alpha) + results)
+    return mismatches
+
+
+# the checker of the "symbolic" engine of invertedInteger.py
+check_property = decide
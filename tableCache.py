@@ -0,0 +1,161 @@
+"""
+Memory-mapped on-disk cache of ⊗ and ⊕ Cayley tables.
+
+Tables are stored as .npy files of their compact dtype in one directory,
+keyed by (n, alpha), and opened with mmap. Every process using the same
+directory, including the workers of a sweep, maps the same pages instead
+of building and holding its own copy. Files are written to a temporary
+name and renamed into place, so concurrent builders never expose a
+partial table. The directory is kept under max_bytes by evicting the
+least recently used tables (a hit refreshes the file's mtime). Tables
+with fewer than min_entries entries are cheaper to rebuild than to map
+and are not cached.
+
+A cache is activated with the use_table_cache() context manager, or for
+the whole process (and the processes it starts) by setting the
+INVERTED_INTEGER_TABLE_CACHE environment variable to the directory.
+While one is active the cayleyTable.py and lightTest.py checkers read
+their tables from it, and multiplicative_span uses a cached ⊗ table when
+one exists. The cache needs NumPy; without it the tables are rebuilt.
+
+    >>> import tempfile, cayleyTable
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     with use_table_cache(directory, min_entries=0) as cache:
+    ...         table = cayleyTable.cached_multiplication_table(3, 1)
+    ...         [list(map(int, row)) for row in table], cache.files()
+    ([[0, 1, 2], [1, 1, 1], [2, 1, 0]], ['mul-3-1.npy'])
+"""
+import contextlib
+import os
+import tempfile
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Default bound on the total size of the cached tables, in bytes
+MAX_BYTES = 1 << 30
+
+# Tables with fewer entries than this are built in memory instead of cached
+MIN_ENTRIES = 1 << 20
+
+# Environment variables activating a cache for the process and its workers
+DIRECTORY_VARIABLE = "INVERTED_INTEGER_TABLE_CACHE"
+MAX_BYTES_VARIABLE = "INVERTED_INTEGER_TABLE_CACHE_BYTES"
+MIN_ENTRIES_VARIABLE = "INVERTED_INTEGER_TABLE_CACHE_MIN_ENTRIES"
+
+# The active TableCache, or None when tables are not cached
+_cache = None
+
+
+class TableCache:
+    def __init__(self, directory, max_bytes=MAX_BYTES, min_entries=MIN_ENTRIES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.min_entries = min_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, kind, n, alpha):
+        return os.path.join(self.directory, f"{kind}-{n}-{alpha}.npy")
+
+    def files(self):
+        """Returns the names of the cached tables, sorted."""
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(".npy"))
+
+    def size(self):
+        """Returns the total size of the cached tables, in bytes."""
+        return sum(os.path.getsize(os.path.join(self.directory, name)) for name in self.files())
+
+    def peek(self, kind, n, alpha):
+        """Returns the memory-mapped table if it is cached, without building it, or None."""
+        path = self.path(kind, n, alpha)
+        try:
+            table = np.load(path, mmap_mode="r")
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return table
+
+    def get(self, kind, n, alpha, build):
+        """Returns the memory-mapped table, building it with build(n, alpha) and caching it on a miss."""
+        if n * n < self.min_entries:
+            return build(n, alpha)
+        table = self.peek(kind, n, alpha)
+        if table is not None:
+            return table
+        path = self.path(kind, n, alpha)
+        table = build(n, alpha)
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as file:
+            try:
+                np.save(file, table)
+            except BaseException:
+                # a failed or interrupted write must not leave its partial file behind
+                file.close()
+                os.remove(file.name)
+                raise
+        os.replace(file.name, path)
+        self.evict(keep=path)
+        return np.load(path, mmap_mode="r")
+
+    def evict(self, keep=None):
+        """Removes the least recently used tables until the cache fits in max_bytes."""
+        entries = []
+        for name in self.files():
+            path = os.path.join(self.directory, name)
+            try:
+                status = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((status.st_mtime, status.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            # processes that still map the file keep their pages until they unmap it
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            total -= size
+
+    def clear(self):
+        for name in self.files():
+            with contextlib.suppress(OSError):
+                os.remove(os.path.join(self.directory, name))
+
+
+def active():
+    """Returns the active TableCache, or None when tables are not cached."""
+    return _cache
+
+
+@contextlib.contextmanager
+def use_table_cache(directory, max_bytes=MAX_BYTES, min_entries=MIN_ENTRIES):
+    """
+    Activates a TableCache for the duration of the with block and yields it.
+
+    The directory is also exported in the environment so that worker
+    processes started inside the block map the same tables.
+    """
+    global _cache
+    previous = _cache
+    saved = {name: os.environ.get(name) for name in (DIRECTORY_VARIABLE, MAX_BYTES_VARIABLE, MIN_ENTRIES_VARIABLE)}
+    _cache = TableCache(directory, max_bytes, min_entries) if np is not None else None
+    os.environ[DIRECTORY_VARIABLE] = directory
+    os.environ[MAX_BYTES_VARIABLE] = str(max_bytes)
+    os.environ[MIN_ENTRIES_VARIABLE] = str(min_entries)
+    try:
+        yield _cache
+    finally:
+        _cache = previous
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+if np is not None and os.environ.get(DIRECTORY_VARIABLE):
+    _cache = TableCache(os.environ[DIRECTORY_VARIABLE], int(os.environ.get(MAX_BYTES_VARIABLE, MAX_BYTES)),
+                        int(os.environ.get(MIN_ENTRIES_VARIABLE, MIN_ENTRIES)))
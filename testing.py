@@ -1,4 +1,15 @@
+import gc
+import itertools
+import json
+import os
+import pickle
+import pstats
+import sqlite3
+import subprocess
+import sys
+import tempfile
 import unittest
+import weakref
 
 from invertedInteger import (
     InvertedInteger, 
@@ -13,8 +24,42 @@ from invertedInteger import (
     has_associative_inverted_addition, 
     associative_addition_pairs, 
     has_inverted_right_distributivity, 
-    distributivity_pairs
+    distributivity_pairs,
+    left_distributivity_pairs,
+    PROPERTIES,
+    check_property,
+    iter_property,
+    iter_idempotent_pairs,
+    iter_distributivity_pairs
 )
+from cayleyTable import addition_table
+from lightTest import generating_set, is_associative_on, has_associative_inverted_multiplication as light_associative
+from crtDecomposition import factorize, check_property as crt_check_property
+from resultStore import ResultStore
+from invertedIntegerArray import InvertedIntegerArray
+from spanClosure import SpanClosure
+from cayleyTable import multiplication_table
+import quadraticSolver
+import benchmarks
+import instrumentation
+from multiplicativeSpan import multiplicative_span
+from InvertedInteger import InvertedInteger as SpanElement
+from counterexamples import find_counterexample, counterexample_pairs, VIOLATIONS
+import samplingChecker
+import symbolicRules
+import powerOrbit
+import tableCache
+import alphaBatch
+import classification
+import isomorphismClasses
+import InvertedIntegers
+import semigroupAnalysis
+import unitGroup
+import ringContext
+import operationKernels
+import crtDecomposition
+import sweep
+import counterexamples
 
 class testing(unittest.TestCase):
     def test_init(self):
@@ -44,6 +89,28 @@ class testing(unittest.TestCase):
         with self.assertRaises(ValueError):
             x * y
 
+    # slotted and interned elements
+    def test_interned(self):
+        x = InvertedInteger(3, 7, 2)
+        self.assertIs(x, InvertedInteger(3, 7, 2))
+        self.assertIs(x * InvertedInteger(5, 7, 2), InvertedInteger(6, 7, 2))
+        self.assertIs(x.ring, InvertedInteger(0, 7, 2).ring)
+        self.assertIsNot(x.ring, InvertedInteger(3, 7, 3).ring)
+        self.assertIs(pickle.loads(pickle.dumps(x)), x)
+        self.assertFalse(hasattr(x, "__dict__"))
+        with self.assertRaises(AttributeError):
+            x.value = 4
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            InvertedInteger(7, 7, 2)
+        with self.assertRaises(ValueError):
+            InvertedInteger(3, 7, 7)
+        with self.assertRaises(ValueError):
+            InvertedInteger(0, 0, 0)
+        with self.assertRaises(TypeError):
+            InvertedInteger(3, 7, 2) * 3
+
     # testing definitions by generating a multiplication table
     def test_mulTable(self):
         n = 5
@@ -147,5 +214,712 @@ class testing(unittest.TestCase):
         with self.assertRaises(ValueError):
             distributivity_pairs(21)
 
+    # table engine
+    def test_tableEngineMatchesPython(self):
+        for prop in PROPERTIES:
+            for n in range(1, 9):
+                for alpha in range(n):
+                    self.assertEqual(check_property(prop, n, alpha, "table"), check_property(prop, n, alpha))
+
+    def test_tableEnginePairs(self):
+        self.assertEqual(distributivity_pairs(20, engine="table"), distributivity_pairs(20))
+        self.assertEqual(len(associative_multiplication_pairs(25, engine="table")), 25 * 26 // 2)
+        with self.assertRaises(ValueError):
+            associative_multiplication_pairs(101, engine="table")
+        with self.assertRaises(ValueError):
+            idempotent_pairs(5, engine="gpu")
+
+    # parallel sweeps
+    def test_parallelPairs(self):
+        self.assertEqual(commutative_addition_pairs(12, workers=2), commutative_addition_pairs(12))
+        self.assertEqual(distributivity_pairs(8, workers=2), distributivity_pairs(8))
+        self.assertEqual(associative_multiplication_pairs(10, engine="table", workers=3),
+                         associative_multiplication_pairs(10))
+        with self.assertRaises(ValueError):
+            idempotent_pairs(5, workers=0)
+
+    # counterexample search
+    def test_counterexamples(self):
+        for prop, (arity, violates) in VIOLATIONS.items():
+            for n in range(1, 9):
+                for alpha in range(n):
+                    witness = find_counterexample(prop, n, alpha, seed=n)
+                    self.assertEqual(witness is None, check_property(prop, n, alpha))
+                    if witness is not None:
+                        self.assertEqual(len(witness), arity)
+                        self.assertTrue(violates(n, alpha, *witness))
+
+    def test_counterexamplePairs(self):
+        failures = counterexample_pairs("right_distributivity", 5)
+        self.assertEqual(sorted(failures), [(n, alpha) for n in range(2, 6) for alpha in range(n)])
+        self.assertEqual(distributivity_pairs(10, engine="search"), distributivity_pairs(10))
+        with self.assertRaises(ValueError):
+            find_counterexample("unknown", 3, 1)
+        # without random samples, the tuples of the generators 1, 2 and 4 of (Z7, ⊗) with alpha = 2 come first
+        tuples = counterexamples.candidates(7, 2, 2, samples=0)
+        self.assertEqual(list(itertools.islice(tuples, 9)), list(itertools.product([1, 2, 4], repeat=2)))
+
+    # Light's associativity test
+    def test_lightMatchesBruteForce(self):
+        for n in range(1, 16):
+            for alpha in range(n):
+                self.assertEqual(light_associative(n, alpha), has_associative_inverted_multiplication(n, alpha))
+                self.assertEqual(light_associative(n, alpha, max_generators=n), has_associative_inverted_multiplication(n, alpha))
+
+    def test_lightOnNonAssociativeTable(self):
+        # 1 generates (Zn, ⊕), which is associative only for n <= 2
+        for n in range(1, 12):
+            self.assertEqual(is_associative_on(addition_table(n, 0), [1 % n]), has_associative_inverted_addition(n, 0))
+
+    def test_lightGeneratingSet(self):
+        self.assertEqual(generating_set(10, 0), [1])
+        self.assertIsNone(generating_set(12, 1, max_generators=2))
+
+    def test_lightPairs(self):
+        self.assertEqual(associative_multiplication_pairs(20, engine="light"), associative_multiplication_pairs(20))
+        self.assertEqual(len(associative_multiplication_pairs(30, engine="light")), 30 * 31 // 2)
+        with self.assertRaises(ValueError):
+            distributivity_pairs(21, engine="light")
+
+    # CRT decomposition
+    def test_factorize(self):
+        self.assertEqual(factorize(1), ())
+        self.assertEqual(factorize(97), ((97, 1),))
+        self.assertEqual(factorize(2 ** 4 * 3 * 7 ** 2), ((2, 4), (3, 1), (7, 2)))
+
+    def test_crtMatchesPython(self):
+        for prop in PROPERTIES:
+            for n in range(1, 13):
+                for alpha in range(n):
+                    self.assertEqual(crt_check_property(prop, n, alpha, "python"), check_property(prop, n, alpha))
+
+    def test_crtPairs(self):
+        self.assertEqual(commutative_addition_pairs(30, engine="crt"), commutative_addition_pairs(30))
+        self.assertEqual(distributivity_pairs(20, engine="crt"), distributivity_pairs(20))
+        self.assertEqual(crtDecomposition.check_component.cache_info().maxsize, crtDecomposition.CACHE_SIZE)
+        self.assertEqual(crtDecomposition.factorize.cache_info().maxsize, crtDecomposition.CACHE_SIZE)
+
+    # persistent result store
+    def test_storeReusesResults(self):
+        with ResultStore(":memory:") as store:
+            self.assertEqual(distributivity_pairs(6, store=store), distributivity_pairs(6))
+            self.assertEqual(len(store.get_many("right_distributivity", [(n, 0) for n in range(1, 7)])), 6)
+            store.put("right_distributivity", 3, 1, True)
+            self.assertIn((3, 1), distributivity_pairs(6, store=store))
+
+    def test_storeKeepsEnginesApart(self):
+        with ResultStore(":memory:") as store:
+            store.put("right_distributivity", 3, 1, True, engine="sampling")
+            self.assertNotIn((3, 1), distributivity_pairs(6, store=store))
+            self.assertIs(store.get("right_distributivity", 3, 1), False)
+            InvertedIntegers.count_inverted_roots_of_unity(6, store=store, engine="solver")
+            self.assertIsNone(store.get("inverted_roots_of_unity", 5, 1))
+            self.assertIsNotNone(store.get("inverted_roots_of_unity", 5, 1, engine="solver"))
+            self.assertEqual(distributivity_pairs(6, engine="table", store=store), [(1, 0)])
+            self.assertIsNotNone(store.get("right_distributivity", 4, 1, engine="table"))
+        with tempfile.TemporaryDirectory() as directory:
+            # a database with an unrelated results table is refused and left untouched
+            path = os.path.join(directory, "other.db")
+            connection = sqlite3.connect(path)
+            connection.execute("CREATE TABLE results (name TEXT, score INTEGER)")
+            connection.execute("INSERT INTO results VALUES ('a', 1)")
+            connection.commit()
+            connection.close()
+            with self.assertRaises(ValueError):
+                ResultStore(path)
+            connection = sqlite3.connect(path)
+            self.assertEqual(connection.execute("SELECT * FROM results").fetchall(), [("a", 1)])
+            connection.close()
+
+    def test_storeResumesSweep(self):
+        tasks = [(n, alpha) for n in range(1, 11) for alpha in range(n)]
+        evaluated = []
+
+        def interrupted(batch):
+            if evaluated:
+                raise KeyboardInterrupt
+            evaluated.extend(batch)
+            return [n for n, alpha in batch]
+
+        with ResultStore(":memory:") as store:
+            with self.assertRaises(KeyboardInterrupt):
+                store.sweep("test", tasks, interrupted, checkpoint_size=5)
+            # the first batch was extended to the end of modulus 3
+            self.assertEqual(evaluated, tasks[:6])
+            resumed = []
+            results = store.sweep("test", tasks, lambda batch: resumed.extend(batch) or [n for n, alpha in batch])
+            self.assertEqual(resumed, tasks[6:])
+            self.assertEqual(results, [n for n, alpha in tasks])
+
+    # array-backed batches
+    def test_arrayMatchesElements(self):
+        for n, alpha in [(7, 2), (12, 5), (2 ** 40 + 15, 2 ** 39 + 7), (2 ** 70 + 25, 2 ** 69 + 3)]:
+            values = [0, 1, 2, n - 1, n // 2, n // 3]
+            a = InvertedIntegerArray(values, n, alpha)
+            b = InvertedIntegerArray(values[::-1], n, alpha)
+            xs, ys = a.to_elements(), b.to_elements()
+            self.assertEqual((a * b).to_elements(), [x * y for x, y in zip(xs, ys)])
+            self.assertEqual((a + b).to_elements(), [x + y for x, y in zip(xs, ys)])
+            self.assertEqual((a * ys[0]).to_elements(), [x * ys[0] for x in xs])
+            self.assertEqual((b[:1] + a).to_elements(), [ys[0] + x for x in xs])
+            product = xs[0]
+            for x in xs[1:]:
+                product = product * x
+            self.assertEqual(a.reduce_mul(), product)
+
+    def test_arrayConversions(self):
+        elements = [InvertedInteger(x, 7, 2) for x in (3, 4, 5)]
+        a = InvertedIntegerArray.from_elements(elements)
+        self.assertEqual(a.to_elements(), elements)
+        self.assertEqual(list(a == InvertedInteger(4, 7, 2)), [False, True, False])
+        self.assertEqual(InvertedIntegerArray.of_ring(5, 2).tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(InvertedIntegerArray([], 5, 2).reduce_mul(), InvertedInteger(0, 5, 2))
+        with self.assertRaises(ValueError):
+            InvertedIntegerArray([7], 7, 2)
+        with self.assertRaises(ValueError):
+            a * InvertedIntegerArray([1, 2, 3], 7, 3)
+
+    # span closure
+    def naiveSpan(self, n, alpha, generators):
+        span = set(generators)
+        queue = list(span)
+        for x in queue:
+            for g in generators:
+                y = (x + g - alpha * x * g) % n
+                if y not in span:
+                    span.add(y)
+                    queue.append(y)
+        return sorted(span)
+
+    def test_spanClosure(self):
+        for n, alpha, generators in [(7, 2, [3, 5]), (12, 0, [4]), (30, 7, [2, 3, 11]), (1, 0, [0]), (64, 5, [9, 9]),
+                                     (5003, 3, [2, 5]), (4096, 1, [3, 6, 10])]:
+            expected = self.naiveSpan(n, alpha, generators)
+            self.assertEqual(SpanClosure(n, alpha, generators).values(), expected)
+            self.assertEqual(SpanClosure(n, alpha, generators, multiplication_table(n, alpha)).values(), expected)
+            incremental = SpanClosure(n, alpha)
+            for g in generators:
+                incremental.add_generator(g)
+                self.assertEqual(incremental.values(), self.naiveSpan(n, alpha, generators[:generators.index(g) + 1]))
+            self.assertEqual(len(incremental), len(expected))
+
+    # quadratic solvers
+    def test_solverMatchesBruteForce(self):
+        for n in range(1, 80):
+            for alpha in range(n):
+                idempotents = [x for x in range(n) if (x + x - alpha * x * x) % n == x]
+                roots = [x for x in range(n) if (x + x - alpha * x * x) % n == 1 % n]
+                self.assertEqual(quadraticSolver.idempotents(n, alpha), idempotents)
+                self.assertEqual(quadraticSolver.inverted_roots_of_unity(n, alpha), roots)
+                self.assertEqual(quadraticSolver.count_inverted_roots_of_unity(n, alpha), len(roots))
+                self.assertEqual(quadraticSolver.has_all_idempotents_property(n, alpha),
+                                 has_all_idempotents_property(n, alpha))
+
+    def test_solverLargeModuli(self):
+        n = 2 ** 10 * 3 ** 5 * 1000003
+        for x in quadraticSolver.inverted_roots_of_unity(n, 12345):
+            self.assertEqual((x + x - 12345 * x * x) % n, 1)
+        self.assertEqual(quadraticSolver.count_idempotents(n, 0), 1)
+        self.assertEqual(idempotent_pairs(50, engine="solver"), idempotent_pairs(50))
+        self.assertEqual(idempotent_pairs(500, engine="solver"), [(1, 0), (2, 1)])
+
+    # side-effect-free imports
+    def test_importHasNoSideEffects(self):
+        for module in ("InvertedIntegers", "invertedInteger"):
+            code = ("import " + module + "; import InvertedIntegers; "
+                    "print('max_roots' in vars(InvertedIntegers), 'best_cases' in vars(InvertedIntegers), "
+                    "InvertedIntegers.default_roots_summary.cache_info().currsize)")
+            result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+            # nothing is printed and the roots summary is neither stored nor computed by the import
+            self.assertEqual(result.stdout, "False False 0\n")
+            self.assertEqual(result.stderr, "")
+
+    def test_importBudget(self):
+        for module in benchmarks.IMPORT_MODULES:
+            # the best of three runs, so that a busy machine does not fail the budget
+            self.assertLess(min(benchmarks.import_time(module) for _ in range(3)), benchmarks.IMPORT_BUDGET)
+
+    def test_lazyRootsSummary(self):
+        import InvertedIntegers
+        self.assertEqual(InvertedIntegers.max_roots, 5)
+        self.assertIs(InvertedIntegers.best_cases, InvertedIntegers.default_roots_summary()[1])
+
+    # benchmark suite
+    def test_benchmarkRun(self):
+        report = benchmarks.run(quick=True, engines=["python", "table"], select="associative_addition",
+                                repeat=2, min_time=0.001)
+        names = {(result["name"], result["params"]["engine"]) for result in report["results"]}
+        self.assertEqual(names, {(name, engine) for name in ("check:associative_addition", "pairs:associative_addition")
+                                 for engine in ("python", "table")})
+        for result in report["results"]:
+            self.assertLessEqual(result["best"], result["median"])
+        self.assertEqual(json.loads(json.dumps(report)), report)
+
+    def test_benchmarkCompare(self):
+        baseline = {"results": [{"name": "a", "params": {"n": 1}, "median": 1.0},
+                                {"name": "b", "params": {"n": 1}, "median": 1.0}]}
+        current = {"results": [{"name": "a", "params": {"n": 1}, "median": 1.1},
+                               {"name": "b", "params": {"n": 1}, "median": 1.5},
+                               {"name": "c", "params": {"n": 1}, "median": 9.0}]}
+        rows = benchmarks.compare(baseline, current, threshold=0.2)
+        self.assertEqual([(row[0], row[-1]) for row in rows], [("a", False), ("b", True)])
+
+    # instrumentation
+    def test_instrumentationCounters(self):
+        with instrumentation.instrument() as recorder:
+            has_associative_inverted_multiplication(4, 1)
+            has_commutative_inverted_addition(5, 2)
+            has_all_idempotents_property(5, 2)
+        calls = [(call["function"], call["evaluations"], call["exit_at"]) for call in recorder.calls]
+        self.assertEqual(calls, [("has_associative_inverted_multiplication", 64, None),
+                                 ("has_commutative_inverted_addition", 2, (0, 1)),
+                                 ("has_all_idempotents_property", 2, (1,))])
+        self.assertIsNone(instrumentation.active())
+        has_all_idempotents_property(5, 2)
+        self.assertEqual(len(recorder.calls), 3)
+
+    def test_instrumentationSweepAndSpan(self):
+        seen = []
+        with instrumentation.instrument(progress=lambda done, total, pair: seen.append((done, total))) as recorder:
+            distributivity_pairs(4, engine="table")
+            multiplicative_span({SpanElement(3, 1009, 5)})
+        self.assertEqual(len(recorder.pairs), 10)
+        self.assertEqual(seen[-1], (10, 10))
+        self.assertEqual(recorder.summary()["multiplicative_span"]["calls"], 1)
+        self.assertIn("slowest (n, alpha) in sweeps", recorder.format())
+
+    def test_instrumentationParallelSweep(self):
+        with instrumentation.instrument() as recorder:
+            self.assertEqual(idempotent_pairs(5, workers=2), idempotent_pairs(5))
+        # the 15 pairs of the parallel sweep, each checked once in a worker and once here
+        self.assertEqual(len(recorder.pairs), 30)
+        self.assertEqual(recorder.summary()["has_all_idempotents_property"]["calls"], 30)
+        self.assertEqual(sorted((pair["n"], pair["alpha"]) for pair in recorder.pairs[:15]), sweep.grid(5))
+        with instrumentation.instrument() as recorder:
+            results = list(iter_property("commutative_addition", range(1, 5), workers=2))
+        self.assertEqual([(n, alpha) for n, alpha, result in results], sweep.grid(4))
+        self.assertEqual([(pair["n"], pair["alpha"]) for pair in recorder.pairs], sweep.grid(4))
+        self.assertEqual(len(recorder.calls), 10)
+
+    def test_instrumentationProfileDump(self):
+        with instrumentation.instrument(profile=True) as recorder:
+            has_associative_inverted_addition(6, 1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sweep.prof")
+            recorder.dump_stats(path)
+            functions = {name for _, _, name in pstats.Stats(path).stats}
+        self.assertIn("has_associative_inverted_addition", functions)
+
+    def test_instrumentationEnvironment(self):
+        code = "import invertedInteger; invertedInteger.has_all_idempotents_property(5, 2)"
+        env = dict(os.environ, INVERTED_INTEGER_INSTRUMENT="1")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+        self.assertIn("has_all_idempotents_property", output.stderr)
+
+    # streaming sweeps
+    def test_streamingMatchesPairs(self):
+        streamed = [(n, alpha) for n, alpha, result in iter_distributivity_pairs(range(1, 8)) if result]
+        self.assertEqual(streamed, distributivity_pairs(7))
+        for prop in PROPERTIES:
+            self.assertEqual(list(iter_property(prop, range(1, 7), workers=2)), list(iter_property(prop, range(1, 7))))
+
+    def test_streamingUnbounded(self):
+        stream = iter_idempotent_pairs(engine="solver")
+        first = list(itertools.islice(stream, 5000))
+        self.assertEqual(first[-1][0], 100)
+        self.assertEqual([(n, alpha) for n, alpha, result in first if result], [(1, 0), (2, 1)])
+        stream.close()
+        odd = iter_property("commutative_addition", [5, 6, 7], where=lambda n, alpha: alpha % 2 == 1)
+        self.assertEqual(list(odd), [(5, 1, False), (5, 3, False), (6, 1, False), (6, 3, False), (6, 5, False),
+                                     (7, 1, False), (7, 3, False), (7, 5, False)])
+
+    def test_streamingEarlyStop(self):
+        stream = iter_property("associative_multiplication", engine="table", workers=2)
+        self.assertEqual(next(stream), (1, 0, True))
+        stream.close()
+        with self.assertRaises(ValueError):
+            iter_property("unknown")
+
+    def test_samplingExhaustiveMatchesBruteForce(self):
+        self.assertEqual(associative_multiplication_pairs(8, engine="sampling"), associative_multiplication_pairs(8))
+        self.assertEqual(distributivity_pairs(8, engine="sampling"), distributivity_pairs(8))
+        self.assertEqual(idempotent_pairs(30, engine="sampling"), idempotent_pairs(30))
+        # every sweep the sampling engine accepts checks all tuples
+        from invertedInteger import SWEEP_LIMITS
+        for degree, limit in SWEEP_LIMITS["sampling"].items():
+            self.assertLessEqual(limit ** degree, samplingChecker.SAMPLES)
+        with self.assertRaises(ValueError):
+            associative_multiplication_pairs(47, engine="sampling")
+        result = samplingChecker.sample_property("associative_addition", 20, 3)
+        self.assertTrue(result.exhaustive)
+        self.assertEqual(result.witness, (0, 0, 1))
+
+    def test_samplingHugeModulus(self):
+        n = 2 ** 127 - 1
+        for prop, (arity, violates) in VIOLATIONS.items():
+            result = samplingChecker.sample_property(prop, n, 12345, samples=2000, seed=7)
+            self.assertFalse(result.exhaustive)
+            if result.witness is None:
+                self.assertEqual(result.samples, 2000)
+                self.assertAlmostEqual(result.density_bound, 1 - 0.05 ** (1 / 2000))
+            else:
+                self.assertTrue(violates(n, 12345, *result.witness))
+        self.assertEqual(samplingChecker.sample_property("commutative_addition", 10 ** 12, 5, seed=3),
+                         samplingChecker.sample_property("commutative_addition", 10 ** 12, 5, seed=3))
+
+    def test_symbolicRulesCrossCheck(self):
+        self.assertEqual(symbolicRules.cross_check(12), [])
+        self.assertEqual(distributivity_pairs(20, engine="symbolic"), distributivity_pairs(20, engine="table"))
+        self.assertEqual(idempotent_pairs(2000, engine="symbolic"), [(1, 0), (2, 1)])
+
+    def test_symbolicRulesAudit(self):
+        rule = symbolicRules.RULES["associative_addition"]
+        symbolicRules.AUDIT = True
+        try:
+            self.assertTrue(symbolicRules.check_property("associative_addition", 2, 1))
+            symbolicRules.RULES["associative_addition"] = lambda n, alpha: True
+            with self.assertRaises(AssertionError):
+                symbolicRules.check_property("associative_addition", 3, 1)
+        finally:
+            symbolicRules.AUDIT = False
+            symbolicRules.RULES["associative_addition"] = rule
+        n = 2 ** 521 - 1
+        self.assertTrue(check_property("commutative_multiplication", n, 7, engine="symbolic"))
+        self.assertFalse(check_property("idempotent", n, 1, engine="symbolic"))
+        self.assertEqual(symbolicRules.obstruction("idempotent", n + 2), 2)
+
+    def test_powerMatchesRepeatedProducts(self):
+        for n, alpha in [(1, 0), (7, 2), (12, 5), (16, 0), (27, 9)]:
+            for value in range(n):
+                x = InvertedInteger(value, n, alpha)
+                product = InvertedInteger(0, n, alpha)
+                for k in range(2 * n + 2):
+                    self.assertIs(x ** k, product)
+                    product = product * x
+        self.assertEqual((InvertedInteger(5, 10 ** 6 + 3, 7) ** 1000002).value, 0)
+        self.assertIs(InvertedInteger(3, 7, 2) ** -1, InvertedInteger(3, 7, 2).inverse())
+
+    def test_powerOrbits(self):
+        for n in range(1, 25):
+            for alpha in range(n):
+                orbits = powerOrbit.power_orbits(n, alpha)
+                orders = powerOrbit.element_orders(n, alpha)
+                for value in range(n):
+                    x = InvertedInteger(value, n, alpha)
+                    index, period = x.orbit()
+                    self.assertEqual(orbits[value], (index, period))
+                    self.assertIs(x ** (index + period), x ** index)
+                    if index > 1:
+                        self.assertIsNot(x ** (index - 1 + period), x ** (index - 1))
+                    returns = [k for k in range(1, index + period + 1) if (x ** k).value == 0]
+                    self.assertEqual(orders[value], returns[0] if returns else None)
+
+    def test_tableCacheSharedAndEvicted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with tableCache.use_table_cache(directory, min_entries=0) as cache:
+                if cache is None:
+                    self.skipTest("the table cache needs NumPy")
+                expected = distributivity_pairs(12)
+                self.assertEqual(distributivity_pairs(12, engine="table"), expected)
+                self.assertEqual(distributivity_pairs(12, engine="table", workers=2), expected)
+                self.assertIn("mul-12-11.npy", cache.files())
+                self.assertIn("add-12-0.npy", cache.files())
+                # ⊕ tables are shared by every alpha
+                self.assertEqual(len(cache.files()), 12 + sum(range(1, 13)))
+                table = cache.peek("mul", 7, 2)
+                self.assertEqual(multiplicative_span({SpanElement(3, 7, 2)}, table),
+                                 multiplicative_span({SpanElement(3, 7, 2)}))
+            self.assertIsNone(tableCache.active())
+            self.assertNotIn(tableCache.DIRECTORY_VARIABLE, os.environ)
+
+            cache = tableCache.TableCache(directory, max_bytes=2 * 100 * 100 + 512, min_entries=0)
+            cache.clear()
+            first = cache.get("mul", 100, 1, multiplication_table)
+            cache.get("mul", 100, 2, multiplication_table)
+            os.utime(cache.path("mul", 100, 1), (1, 1))
+            os.utime(cache.path("mul", 100, 2), (2, 2))
+            cache.peek("mul", 100, 1)
+            cache.get("mul", 100, 3, multiplication_table)
+            self.assertEqual(cache.files(), ["mul-100-1.npy", "mul-100-3.npy"])
+            self.assertLessEqual(cache.size(), cache.max_bytes)
+            self.assertEqual(first.tolist(), multiplication_table(100, 1).tolist())
+
+            class Unsaveable:
+                def __reduce__(self):
+                    raise OSError("disk full")
+
+            def failing_build(n, alpha):
+                raise MemoryError
+
+            cache.clear()
+            for build, error in ((failing_build, MemoryError), (lambda n, alpha: Unsaveable(), OSError)):
+                with self.assertRaises(error):
+                    cache.get("mul", 100, 4, build)
+                # neither the table nor a partial temporary file is left behind
+                self.assertEqual(os.listdir(directory), [])
+
+    def test_alphaBatchMatchesPerAlpha(self):
+        for prop in PROPERTIES:
+            for n in range(1, 13):
+                expected = [alpha for alpha in range(n) if check_property(prop, n, alpha)]
+                self.assertEqual(alphaBatch.qualifying_alphas(prop, n), expected)
+        self.assertEqual(distributivity_pairs(30, engine="alpha"), distributivity_pairs(30, engine="table"))
+        self.assertEqual(idempotent_pairs(300, engine="alpha"), [(1, 0), (2, 1)])
+        # a stream over moduli keeps a bounded number of memoised results
+        alphaBatch._qualifying.cache_clear()
+        for _ in iter_property("idempotent", range(1, 2 * alphaBatch.CACHE_SIZE), engine="alpha"):
+            pass
+        self.assertEqual(alphaBatch._qualifying.cache_info().currsize, alphaBatch.CACHE_SIZE)
+
+    def test_alphaBatchSmallBlocks(self):
+        block_size = alphaBatch.BLOCK_SIZE
+        alphaBatch.BLOCK_SIZE = 50
+        try:
+            for prop in ("associative_multiplication", "right_distributivity", "commutative_multiplication"):
+                for n in (9, 10):
+                    self.assertEqual(alphaBatch._qualifying.__wrapped__(prop, n),
+                                     {alpha for alpha in range(n) if check_property(prop, n, alpha)})
+        finally:
+            alphaBatch.BLOCK_SIZE = block_size
+        with self.assertRaises(ValueError):
+            alphaBatch.qualifying_alphas("unknown", 3)
+
+    def test_leftDistributivity(self):
+        self.assertEqual(left_distributivity_pairs(8), [(1, 0)])
+        for engine in ("table", "search", "crt", "symbolic", "alpha", "sampling"):
+            self.assertEqual(left_distributivity_pairs(8, engine=engine), [(1, 0)])
+
+    def test_classifyMatchesCheckers(self):
+        classes = classification.classify_range(9, witnesses=True)
+        self.assertEqual(classes, classification.classify_range(9, witnesses=True, workers=2))
+        for (n, alpha), result in classes.items():
+            for prop, bit in classification.BITS.items():
+                self.assertEqual(bool(result.mask & bit), check_property(prop, n, alpha))
+                if prop in result.witnesses:
+                    self.assertTrue(VIOLATIONS[prop][1](n, alpha, *result.witnesses[prop]))
+            self.assertEqual(classification._classify_lists(n, alpha, classification.ALL), result.witnesses)
+
+    def test_classifyRequestedProperties(self):
+        result = classification.classify(6, 5, ["idempotent", "associative_multiplication"])
+        self.assertEqual(classification.names(result.mask), ["associative_multiplication"])
+        self.assertIsNone(result.witnesses)
+        mask = classification.BITS["commutative_addition"] | classification.BITS["left_distributivity"]
+        self.assertEqual(classification.classify(2, 1, mask).mask, classification.BITS["commutative_addition"])
+        self.assertEqual(classification.classify(1, 0).mask, classification.ALL)
+        with self.assertRaises(ValueError):
+            classification.classify(3, 1, ["unknown"])
+
+    def test_isomorphismClassesMatchBruteForce(self):
+        for n in range(1, 6):
+            tables = [multiplication_table(n, alpha) for alpha in range(n)]
+            for alpha, beta in itertools.product(range(n), repeat=2):
+                # bijections preserving both ⊕ and ⊗
+                found = any(all(p[(x - y) % n] == (p[x] - p[y]) % n and p[tables[alpha][x][y]] == tables[beta][p[x]][p[y]]
+                                for x in range(n) for y in range(n))
+                            for p in itertools.permutations(range(n)))
+                u = isomorphismClasses.isomorphism(n, alpha, beta)
+                self.assertEqual(u is not None, found)
+                self.assertEqual(found, isomorphismClasses.canonical_alpha(n, alpha)
+                                 == isomorphismClasses.canonical_alpha(n, beta))
+
+    def test_isomorphismClassesFingerprintsAndReuse(self):
+        for n, members in isomorphismClasses.isomorphism_classes(30).items():
+            self.assertEqual(sum(len(alphas) for alphas in members.values()), n)
+            for canonical, alphas in members.items():
+                self.assertEqual({isomorphismClasses.fingerprint(n, alpha) for alpha in alphas},
+                                 {isomorphismClasses.fingerprint(n, canonical)})
+        self.assertNotEqual(isomorphismClasses.fingerprint(12, 2), isomorphismClasses.fingerprint(12, 3))
+        self.assertEqual([list(map(int, row)) for row in isomorphismClasses.canonical_table(9, 6)],
+                         [list(map(int, row)) for row in multiplication_table(9, 3)])
+        for prop in PROPERTIES:
+            self.assertEqual(check_property(prop, 24, 10, engine="iso"), check_property(prop, 24, 10))
+        self.assertEqual(distributivity_pairs(20, engine="iso"), distributivity_pairs(20, engine="table"))
+        self.assertEqual(isomorphismClasses.check_class.cache_info().maxsize, isomorphismClasses.CACHE_SIZE)
+
+    def test_semigroupAnalysisMatchesBruteForce(self):
+        for n in range(1, 13):
+            for alpha in range(n):
+                table = multiplication_table(n, alpha)
+                s = semigroupAnalysis.analyse(n, alpha)
+                right = [frozenset([x] + [table[x][y] for y in range(n)]) for x in range(n)]
+                left = [frozenset([x] + [table[y][x] for y in range(n)]) for x in range(n)]
+                two_sided = [frozenset(b for a in left[x] for b in right[a]) for x in range(n)]
+                self.assertEqual([sorted(right[x]) for x in range(n)], [s.principal_right_ideal(x) for x in range(n)])
+                self.assertEqual([sorted(left[x]) for x in range(n)], [s.principal_left_ideal(x) for x in range(n)])
+                self.assertEqual(set(map(frozenset, s.r_classes)),
+                                 {frozenset(y for y in range(n) if right[y] == right[x]) for x in range(n)})
+                # D = J in a finite semigroup
+                self.assertEqual(set(map(frozenset, s.d_classes)),
+                                 {frozenset(y for y in range(n) if two_sided[y] == two_sided[x]) for x in range(n)})
+                self.assertEqual(s.l_classes, s.r_classes)
+                self.assertEqual(s.h_classes, s.r_classes)
+                self.assertEqual(s.identity, 0)
+                self.assertEqual(s.idempotents, [x for x in range(n) if table[x][x] == x])
+                self.assertEqual(len(s.minimal_ideal), min(map(len, two_sided)))
+                self.assertEqual(s.subsemigroup([n - 1]), sorted(SpanClosure(n, alpha, [n - 1]).values()))
+
+    def test_semigroupAnalysisIdeals(self):
+        s = semigroupAnalysis.analyse(6, 2)
+        self.assertIs(s, semigroupAnalysis.analyse(6, 2))
+        self.assertEqual(s.zero, None)
+        self.assertEqual(semigroupAnalysis.analyse(4, 1).zero, 1)
+        self.assertEqual(s.ideal([2, 3], "left"), s.ideal([2, 3], "right"))
+        self.assertEqual(s.ideal([]), [])
+        with self.assertRaises(ValueError):
+            s.ideal([1], "middle")
+        with self.assertRaises(ValueError):
+            semigroupAnalysis.analyse(0, 0)
+        with self.assertRaises(ValueError):
+            semigroupAnalysis.analyse(5, 5)
+
+    def test_unitGroupMatchesBruteForce(self):
+        for n in range(1, 40):
+            for alpha in range(n):
+                expected = [next((y for y in range(n) if (x + y - alpha * x * y) % n == 0), None) for x in range(n)]
+                self.assertEqual(unitGroup.inverses(n, alpha), expected)
+                self.assertEqual(unitGroup.units(n, alpha), [x for x in range(n) if expected[x] is not None])
+        self.assertEqual(unitGroup.batch_inverse([], 7), [])
+        self.assertEqual(unitGroup.batch_inverse([3, 5, 7, 9], 16), [pow(v, -1, 16) for v in (3, 5, 7, 9)])
+        with self.assertRaises(ValueError):
+            unitGroup.batch_inverse([3, 4], 8)
+        with self.assertRaises(ValueError):
+            unitGroup.units(4, 4)
+
+    def test_inverseMethods(self):
+        x = InvertedInteger(3, 7, 2)
+        self.assertEqual(x * x.inverse(), InvertedInteger(unitGroup.IDENTITY, 7, 2))
+        self.assertEqual(x ** -3, (x ** 3).inverse())
+        with self.assertRaises(ValueError):
+            InvertedInteger(4, 7, 2).inverse()
+        with self.assertRaises(ValueError):
+            InvertedInteger(4, 7, 2) ** -1
+        batch = InvertedIntegerArray([0, 1, 3, 5, 6], 7, 2)
+        self.assertEqual(batch.inverse().tolist(), [unitGroup.inverses(7, 2)[x] for x in batch.tolist()])
+        with self.assertRaises(ValueError):
+            InvertedIntegerArray([3, 4], 7, 2).inverse()
+
+    def test_bigModulusRingContext(self):
+        for bits in (64, 1024):
+            n, alpha, values = benchmarks._big_ring(bits)
+            # alpha a unit, alpha sharing the factor 2 with the modulus, and alpha = 0
+            for n, multiplier in ((n, alpha), (n * 6, alpha * 2), (n, 0)):
+                x, y = (InvertedInteger(value, n, multiplier) for value in values[:2])
+                self.assertEqual((x * y).value, (x.value + y.value - multiplier * x.value * y.value) % n)
+                # small powers against repeated ⊗, and a huge one through x^(j + k) = x^j ⊗ x^k
+                product = InvertedInteger(0, n, multiplier)
+                for k in range(7):
+                    self.assertEqual(x ** k, product)
+                    product = product * x
+                k = values[2]
+                self.assertEqual(x ** (k + 1), x ** k * x)
+                self.assertEqual(x ** (2 * k + 3), x ** k * x ** 3 * x ** k)
+        # power() computes alpha^-1 itself and never creates ring contexts
+        contexts = len(ringContext._contexts)
+        n, product = 10 ** 40 + 1, 0
+        for _ in range(5):
+            product = (product + 3 - 17 * product * 3) % n
+        self.assertEqual(ringContext.power(3, 5, n, 17), product)
+        self.assertEqual(len(ringContext._contexts), contexts)
+        self.assertIsNone(InvertedInteger(1, 12, 4).ring.inverse_multiplier)
+        self.assertEqual(InvertedInteger(1, 12, 5).ring.inverse_multiplier, 5)
+        self.assertEqual(powerOrbit.power_orbits(9, 4), [powerOrbit.power_orbit(x, 9, 4) for x in range(9)])
+
+    def test_operationKernelsDefaultMatchesReference(self):
+        structure = operationKernels.Structure()
+        for prop in PROPERTIES:
+            for n in range(1, 10):
+                for alpha in range(n):
+                    self.assertEqual(structure.check_property(prop, n, alpha), check_property(prop, n, alpha))
+        self.assertEqual(structure.multiplicative_span([3, 5], 7, 2), SpanClosure(7, 2, [3, 5]).values())
+        self.assertEqual(distributivity_pairs(8, engine=structure), distributivity_pairs(8))
+        self.assertEqual(structure.multiply(3, 5, 7, 2), 6)
+        self.assertEqual(structure.add(3, 5, 7, 2), 5)
+
+    def test_operationKernelsGeneratedCode(self):
+        formula = "(x - 2)**3 + beta*x*y**2 - 7*alpha + -y"
+        kernel = operationKernels.compile_operation(formula, ("alpha", "beta"))
+        self.assertIs(kernel, operationKernels.compile_operation(formula, ("alpha", "beta")))
+        for n in (1, 6, 97, operationKernels.NUMPY_LIMIT):
+            alpha, beta = 5 % n, (n - 3) % n
+            values = [0, 1, n // 2, n - 1]
+            expected = [[((x - 2) ** 3 + beta * x * y ** 2 - 7 * alpha - y) % n for y in values] for x in values]
+            self.assertEqual([[kernel.scalar(x, y, n, alpha, beta) for y in values] for x in values], expected)
+            if operationKernels.np is not None:
+                x = operationKernels.np.array(values, dtype=operationKernels.np.int64)
+                self.assertEqual(kernel.arrays(x[:, None], x[None, :], n, alpha, beta).tolist(), expected)
+        table = kernel.lists(6, 2, 3)
+        self.assertEqual(table, [[kernel.scalar(x, y, 6, 2, 3) for y in range(6)] for x in range(6)])
+        for bad in ("x / y", "x ** y", "x ** 17", "z * x", "x.real", "1.5 * x", "(x**16)**16", "((2 + 3)**16)**16",
+                    "x**16 * y**16 * (x*y)**16 * alpha**16 * x"):
+            with self.assertRaises(ValueError):
+                operationKernels.compile_operation(bad, ("alpha",))
+        with self.assertRaises(ValueError):
+            operationKernels.compile_operation("x", ("n",))
+        self.assertEqual(operationKernels.compile_operation("(x + y)**8 * (x - 1)**8 * alpha**16 * y**16 * x**16",
+                                                            ("alpha",)).scalar(2, 3, 7, 4),
+                         (5 ** 8 * 1 ** 8 * 4 ** 16 * 3 ** 16 * 2 ** 16) % 7)
+        self.assertIsNotNone(operationKernels.compile_operation.cache_info().maxsize)
+        with self.assertRaises(ValueError):
+            operationKernels.Structure(alpha=2)
+        for value in (2.5, 2.0, "2", True, None):
+            with self.assertRaises(ValueError):
+                operationKernels.Structure(addition="beta*x - y", beta=value)
+
+    def test_operationKernelsVariantsAsEngine(self):
+        # with x ⊕ y = 2x - y, (x ⊕ y) ⊗ z = (x ⊗ z) ⊕ (y ⊗ z) for every n and alpha
+        variant = operationKernels.Structure(addition="beta*x - y", beta=2)
+        self.assertEqual(distributivity_pairs(7, engine=variant), [(n, alpha) for n in range(1, 8) for alpha in range(n)])
+        self.assertEqual(associative_addition_pairs(6, engine=variant), [(1, 0), (2, 0), (2, 1)])
+        self.assertEqual(idempotent_pairs(6, engine=variant, workers=2), idempotent_pairs(6))
+        ring = operationKernels.Structure("x*y", "x + y")
+        self.assertTrue(all(ring.check_property(prop, 12, 0) for prop in PROPERTIES if prop != "idempotent"))
+        self.assertEqual(ring.multiplicative_span([2], 12, 0), [2, 4, 8])
+        store = ResultStore(":memory:")
+        # the results of the variant are stored apart from those of the inverted integers
+        self.assertEqual(len(distributivity_pairs(4, engine=variant, store=store)), 10)
+        self.assertEqual(distributivity_pairs(4, store=store), [(1, 0)])
+        with self.assertRaises(ValueError):
+            check_property("idempotent", 3, 1, engine=None)
+
+    def test_sharedOperations(self):
+        for n, alpha in ((7, 2), (12, 8), (operationKernels.NUMPY_LIMIT, operationKernels.NUMPY_LIMIT - 1)):
+            values = sorted({0, 1, 2, n // 2, n - 2, n - 1})
+            for x, y in itertools.product(values, repeat=2):
+                self.assertEqual(ringContext.multiply(x, y, n, alpha), ringContext.polynomial(x, y, alpha) % n)
+                self.assertEqual(ringContext.add(x, y, n), (x - y) % n)
+            if operationKernels.np is not None:
+                x = operationKernels.np.array(values, dtype=operationKernels.np.int64)
+                self.assertEqual(ringContext.multiply(x[:, None], x[None, :], n, alpha).tolist(),
+                                 [[ringContext.multiply(a, b, n, alpha) for b in values] for a in values])
+
+    def test_internedValuesAreInts(self):
+        for args in ((3.0, 7, 2), (3, 7.0, 2), (3, 7, 2.0), ("3", 7, 2)):
+            with self.assertRaises(TypeError):
+                InvertedInteger(*args)
+        x = InvertedInteger(True, 7, 2)
+        self.assertIs(type(x.value), int)
+        self.assertIs(x.ring, InvertedInteger(3, 7, 2).ring)
+        self.assertIs(type((InvertedInteger(3, 7, 2) * x).value), int)
+        if operationKernels.np is not None:
+            np = operationKernels.np
+            y = InvertedInteger(np.int64(3), np.int64(7), np.int8(2))
+            self.assertIs(y, InvertedInteger(3, 7, 2))
+            self.assertIs(type(y.value), int)
+
+    def test_internedElementsAreCollected(self):
+        x = InvertedInteger(57, 1009, 3)
+        ring, reference = x.ring, weakref.ref(x)
+        self.assertIs(x, InvertedInteger(57, 1009, 3))
+        del x
+        gc.collect()
+        self.assertIsNone(reference())
+        self.assertNotIn(57, ring.pools[InvertedInteger])
+        reference = weakref.ref(ring)
+        del ring
+        gc.collect()
+        self.assertIsNone(reference())
+        self.assertNotIn((1009, 3), ringContext._contexts)
+        self.assertEqual(InvertedInteger(57, 1009, 3).value, 57)
+
 if __name__ == "__main__": 
        unittest.main()  
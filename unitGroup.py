@@ -0,0 +1,84 @@
+"""
+Identity, units and inverses of the monoid (Zn, ⊗).
+
+The identity of ⊗ is 0, since x ⊗ 0 = x. Solving x ⊗ y = 0 gives
+y (1 - α x) ≡ -x (mod n). When t = 1 - α x is a unit mod n the unique
+inverse is y = -x / t. Otherwise a common prime p of t and n would divide
+x as well, so p | 1 - α x + α x = 1; hence x is a ⊗-unit exactly when
+gcd(1 - α x, n) = 1.
+
+units() finds the non-units without a gcd per element: a prime p of n
+divides 1 - α x exactly when x ≡ α^-1 (mod p), so the non-units are a
+union of residue classes, one for each prime p of n not dividing α, and
+are crossed out like a sieve. inverses() then inverts every t at once with
+Montgomery's trick in batch_inverse: one modular inverse of the product of
+all the t and three multiplications per element, instead of one extended
+gcd per element.
+
+    >>> units(6, 2)
+    [0, 1, 3, 4]
+    >>> inverses(6, 2)
+    [0, 1, None, 3, 4, None]
+    >>> batch_inverse([2, 3, 4], 7)
+    [4, 5, 2]
+"""
+from crtDecomposition import factorize
+
+# identity of ⊗ in every (Zn, alpha)
+IDENTITY = 0
+
+
+def batch_inverse(values, modulus):
+    """
+    Returns the inverses mod modulus of the values with Montgomery's simultaneous inversion.
+
+    Raises ValueError if one of the values is not invertible.
+    """
+    values = list(values)
+    prefix = []
+    product = 1
+    for value in values:
+        product = product * value % modulus
+        prefix.append(product)
+    try:
+        inverse = pow(product, -1, modulus)
+    except ValueError:
+        raise ValueError("Values must be invertible modulo the modulus") from None
+    inverses = [0] * len(values)
+    # inverse = (v_0 ... v_i)^-1 at step i, so v_i^-1 = inverse * (v_0 ... v_(i-1))
+    for i in range(len(values) - 1, 0, -1):
+        inverses[i] = inverse * prefix[i - 1] % modulus
+        inverse = inverse * values[i] % modulus
+    if values:
+        inverses[0] = inverse % modulus
+    return inverses
+
+
+def unit_mask(n, alpha):
+    """Returns a bytearray with a 1 at every ⊗-unit x of Zn and 0 elsewhere."""
+    if n <= 0:
+        raise ValueError("Modulus must be positive.")
+    if not (0 <= alpha < n):
+        raise ValueError("Multiplier must be between 0 and modulus-1")
+    mask = bytearray(b"\1") * n
+    for p, _ in factorize(n):
+        if alpha % p:
+            # p | 1 - α x  iff  x ≡ α^-1 (mod p)
+            start = pow(alpha, -1, p)
+            mask[start::p] = bytes(len(range(start, n, p)))
+    return mask
+
+
+def units(n, alpha):
+    """Returns the sorted ⊗-units of Zn."""
+    return [x for x, unit in enumerate(unit_mask(n, alpha)) if unit]
+
+
+def inverses(n, alpha):
+    """Returns the list whose x-th entry is the ⊗-inverse of x in Zn, or None if x is not a unit."""
+    found = units(n, alpha)
+    denominators = batch_inverse([(1 - alpha * x) % n for x in found], n)
+    result = [None] * n
+    for x, denominator in zip(found, denominators):
+        result[x] = -x * denominator % n
+    return result